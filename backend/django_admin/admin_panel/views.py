@@ -23,6 +23,7 @@ from country.models import (
     TravelApp,
     UsefulTip,
 )
+from country.refresh_executor import refresh_executor
 
 
 User = get_user_model()
@@ -138,6 +139,8 @@ class AdminSummaryView(APIView):
                     UserCountrySuggestion.objects.select_related("user").order_by("-created_at")
                     .values("id", "country", "message", "user_email", "user_name", "created_at")[:10]
                 ),
+                # Background cache refresh queue of the worker serving this request.
+                "refresh_queue": refresh_executor.metrics(),
             },
             status=status.HTTP_200_OK,
         )
@@ -96,6 +96,10 @@ class Bookmark(models.Model):
 			('user', 'country', 'bookmark_type'),
 			('user', 'app', 'bookmark_type'),
 		]
+		indexes = [
+			# Bookmark list: a user's bookmarks, newest first.
+			models.Index(fields=['user', '-created_at'], name='bookmark_user_recent_idx'),
+		]
 	
 	def __str__(self):
 		if self.bookmark_type == 'country' and self.country:
@@ -1,8 +1,8 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from .models import (
-    Country, CountryVisit, AppCategory, TravelApp, CountryServiceProvider, AppScreenshot, Review, 
-    OriginCountryAssistance, EmergencyContact, LocalPhrase, UsefulTip
+    Country, CountryVisit, CountryGeography, AppCategory, TravelApp, CountryServiceProvider, AppScreenshot, Review, 
+    OriginCountryAssistance, EmergencyContact, LocalPhrase, UsefulTip, CountrySnapshot
 )
 from django.urls import reverse
 
@@ -26,6 +26,12 @@ class CountryVisitAdmin(admin.ModelAdmin):
     list_filter = ('updated_at',)
 
 
+@admin.register(CountryGeography)
+class CountryGeographyAdmin(admin.ModelAdmin):
+    list_display = ('country', 'latitude', 'longitude', 'updated_at')
+    search_fields = ('country__name', 'country__code')
+
+
 
 @admin.register(AppCategory)
 class AppCategoryAdmin(admin.ModelAdmin):
@@ -90,3 +96,10 @@ class UsefulTipAdmin(admin.ModelAdmin):
     search_fields = ('country__name', 'tip')
     list_filter = ('country',)
     raw_id_fields = ('country',)
+
+@admin.register(CountrySnapshot)
+class CountrySnapshotAdmin(admin.ModelAdmin):
+    list_display = ('code', 'version', 'built_version', 'schema', 'built_at')
+    search_fields = ('code',)
+    readonly_fields = ('code', 'data', 'version', 'built_version', 'schema', 'built_at')
+    exclude = ('payload',)
@@ -1,6 +1,25 @@
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.models.signals import post_migrate
+
+
+def _is_app_server():
+    # manage.py commands other than runserver (migrate, shell, tests...) shouldn't warm on import.
+    if not sys.argv or not sys.argv[0].endswith("manage.py"):
+        return True
+    return sys.argv[1:2] == ["runserver"]
 
 
 class CountryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'country'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        if getattr(settings, "CACHE_WARMUP_ON_MIGRATE", False):
+            post_migrate.connect(signals.warm_caches_after_migrate, sender=self, dispatch_uid="country_cache_warmup")
+        if getattr(settings, "CACHE_WARMUP_ON_STARTUP", False) and _is_app_server():
+            signals.schedule_startup_warmup()
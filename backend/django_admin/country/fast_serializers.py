@@ -0,0 +1,115 @@
+# country/fast_serializers.py
+"""Plain-dict serializers for the hot read paths.
+
+Each function returns exactly what its DRF counterpart in serializers.py
+returns (tests.py checks the two stay in step), but builds it from
+``.values()`` rows: no model instances and no per-field serializer objects.
+Used instead of the DRF serializers while settings.FAST_SERIALIZERS is on.
+"""
+from django.conf import settings
+
+from .models import AppCategory, AppScreenshot, Country, EmergencyContact, LocalPhrase, Review, TravelApp, UsefulTip
+
+# Keeps `app_id IN (...)` under SQLite's bound-parameter limit.
+ID_CHUNK_SIZE = 500
+
+_APP_COLUMNS = (
+    "id", "name", "description", "icon_url", "ios_link", "android_link", "website_link", "affiliate_url",
+    "is_sponsored", "category_id", "category__name",
+)
+
+
+def enabled():
+    return getattr(settings, "FAST_SERIALIZERS", True)
+
+
+def _flag_url(name):
+    return Country._meta.get_field("flag").storage.url(name) if name else None
+
+
+def _ids_by_app(model, app_ids):
+    grouped = {app_id: [] for app_id in app_ids}
+    for start in range(0, len(app_ids), ID_CHUNK_SIZE):
+        chunk = app_ids[start:start + ID_CHUNK_SIZE]
+        for app_id, pk in model.objects.filter(app_id__in=chunk).order_by("id").values_list("app_id", "id"):
+            grouped[app_id].append(pk)
+    return grouped
+
+
+def _app_rows(queryset):
+    """(category_id, TravelAppSerializer dict) per app, in queryset order."""
+    rows = list(queryset.values(*_APP_COLUMNS))
+    app_ids = [row["id"] for row in rows]
+    screenshots = _ids_by_app(AppScreenshot, app_ids)
+    reviews = _ids_by_app(Review, app_ids)
+    return [
+        (
+            row["category_id"],
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "description": row["description"],
+                "icon_url": row["icon_url"],
+                "ios_link": row["ios_link"],
+                "android_link": row["android_link"],
+                # TravelApp.get_download_url
+                "platforms": {
+                    "download": row["affiliate_url"] or row["website_link"] or row["android_link"] or row["ios_link"],
+                },
+                "screenshots": screenshots[row["id"]],
+                "reviews": reviews[row["id"]],
+                "is_sponsored": row["is_sponsored"],
+                "category": row["category__name"],
+            },
+        )
+        for row in rows
+    ]
+
+
+def serialize_travel_apps(queryset):
+    """TravelAppSerializer(queryset, many=True).data"""
+    return [app for _, app in _app_rows(queryset)]
+
+
+def _country_dict(row, categories):
+    return {
+        "code": row["code"],
+        "name": row["name"],
+        "flag": _flag_url(row["flag"]),
+        "description": row["description"],
+        "curated_app_categories": categories,
+    }
+
+
+def serialize_countries(queryset):
+    """CountrySerializer(queryset, many=True).data, without a categories_qs context."""
+    return [_country_dict(row, []) for row in queryset.values("code", "name", "flag", "description")]
+
+
+def serialize_country_page(country):
+    """CountrySerializer data for the country page (categories holding this country's apps)."""
+    apps_by_category = {}
+    for category_id, app in _app_rows(TravelApp.objects.filter(country=country).order_by("id")):
+        apps_by_category.setdefault(category_id, []).append(app)
+    categories = (
+        AppCategory.objects.filter(apps__country=country).distinct().order_by("id").values_list("id", "name")
+    )
+    row = {"code": country.code, "name": country.name, "flag": country.flag.name, "description": country.description}
+    return _country_dict(
+        row, [{"name": name, "apps": apps_by_category.get(category_id, [])} for category_id, name in categories]
+    )
+
+
+def serialize_essentials(country):
+    """EssentialsSerializer(country).data"""
+    return {
+        "code": country.code,
+        "name": country.name,
+        "emergencies": list(
+            EmergencyContact.objects.filter(country=country).order_by("id").values("name", "phone", "email", "description")
+        ),
+        "phrases": list(
+            LocalPhrase.objects.filter(country=country).order_by("id").values("original", "translation", "context_note")
+        ),
+        "tips": list(UsefulTip.objects.filter(country=country).order_by("id").values("tip")),
+    }
@@ -0,0 +1,307 @@
+# country/feeds.py
+"""Shared snapshots of upstream feeds that are identical for every country.
+
+Government advisory feeds and the global EONET event list are downloaded once
+per TTL, parsed once, and kept both in process memory and in the Django cache
+so every worker and every country in a refresh batch reuses the same copy.
+"""
+import html
+import re
+import threading
+import time
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
+from .geo import countries_for_point
+from .http_client import fetch_json, open_url
+from .sources import SourceReservation
+from .utils import safe_cache_get, safe_cache_set
+
+
+GOV_ADVISORY_FEEDS = [
+    {
+        "name": "gov_state",
+        "url": "https://travel.state.gov/_res/rss/TAsTWs.xml",
+        "source_label": "U.S. State Dept",
+    },
+    {
+        "name": "gov_cdc",
+        "url": "https://wwwnc.cdc.gov/travel/rss/notices",
+        "source_label": "CDC Travel Notices",
+    },
+]
+
+GOV_ADVISORY_FEED_TTL = 30 * 60            # re-download at most every 30 min
+GOV_ADVISORY_FEED_STORAGE_TTL = 6 * 60 * 60
+
+EONET_EVENTS_URL = "https://eonet.gsfc.nasa.gov/api/v3/events?status=open&limit=50"
+EONET_SNAPSHOT_TTL = 15 * 60
+EONET_SNAPSHOT_STORAGE_TTL = 6 * 60 * 60
+
+RSS_READ_CHUNK_SIZE = 16 * 1024
+RSS_ITEM_FIELDS = ("title", "link", "description", "pubDate")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_MARKUP_RE = re.compile(r"<[^>]*>")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_snapshots = {}
+_snapshot_locks = {}
+_snapshot_locks_guard = threading.Lock()
+
+
+def _normalize_rss_text(value):
+    # Descriptions often carry escaped HTML; drop the markup and decode entities.
+    value = _MARKUP_RE.sub(" ", value or "")
+    value = html.unescape(value)
+    return _WHITESPACE_RE.sub(" ", value).strip()
+
+
+def _extract_rss_tag(xml, tag):
+    match = re.search(rf"<{tag}>([\s\S]*?)</{tag}>", xml, re.IGNORECASE)
+    if not match:
+        return ""
+    value = match.group(1)
+    cdata = re.fullmatch(r"\s*<!\[CDATA\[([\s\S]*?)\]\]>\s*", value)
+    # Undo the XML-level escaping first, the same way an XML parser would.
+    value = cdata.group(1) if cdata else html.unescape(value)
+    return _normalize_rss_text(value)
+
+
+def parse_rss_items(xml):
+    """Regex fallback that parses a whole RSS string into normalized item dicts."""
+    items = []
+    for match in re.finditer(r"<item>([\s\S]*?)</item>", xml):
+        chunk = match.group(1)
+        title = _extract_rss_tag(chunk, "title")
+        if not title:
+            continue
+        items.append(
+            {
+                "title": title,
+                "link": _extract_rss_tag(chunk, "link"),
+                "description": _extract_rss_tag(chunk, "description"),
+                "pubDate": _extract_rss_tag(chunk, "pubDate"),
+            }
+        )
+    return items
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def iter_rss_items(stream, chunk_size=RSS_READ_CHUNK_SIZE):
+    """Yield normalized RSS item dicts while ``stream`` is still being read.
+
+    Callers can stop iterating as soon as they have enough items; nothing past
+    that point is downloaded or parsed. Malformed documents fall back to the
+    regex parser for the remaining items.
+    """
+    parser = XMLPullParser(events=("end",))
+    consumed = []
+    yielded = 0
+
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        consumed.append(chunk)
+        try:
+            parser.feed(chunk)
+            events = list(parser.read_events())
+        except ParseError:
+            rest = stream.read()
+            document = b"".join(consumed) + (rest or b"")
+            yield from parse_rss_items(document.decode("utf-8", errors="ignore"))[yielded:]
+            return
+
+        for _, element in events:
+            if _local_name(element.tag) != "item":
+                continue
+            fields = {name: "" for name in RSS_ITEM_FIELDS}
+            for child in element:
+                name = _local_name(child.tag)
+                if name in fields and not fields[name]:
+                    fields[name] = _normalize_rss_text("".join(child.itertext()))
+            element.clear()
+            if not fields["title"]:
+                continue
+            yielded += 1
+            yield fields
+
+
+def _tokenize(text):
+    return _TOKEN_RE.findall(str(text or "").lower())
+
+
+def _snapshot_lock(name):
+    with _snapshot_locks_guard:
+        return _snapshot_locks.setdefault(name, threading.Lock())
+
+
+def _is_snapshot_fresh(snapshot, ttl_seconds):
+    return bool(snapshot) and (int(time.time()) - snapshot["fetched_at"]) < ttl_seconds
+
+
+def _get_shared_snapshot(name, source, ttl_seconds, storage_ttl_seconds, download, build):
+    """Return a process-local snapshot, falling back to the shared cache and then the network.
+
+    ``download(reservation)`` returns JSON-serializable data that is stored in
+    the Django cache for other workers; ``build(data, fetched_at)`` turns it into the
+    indexed in-memory snapshot. A stale snapshot is served if the source is
+    capped or failing.
+    """
+    snapshot = _snapshots.get(name)
+    if _is_snapshot_fresh(snapshot, ttl_seconds):
+        return snapshot
+
+    with _snapshot_lock(name):
+        # Another thread may have refreshed it while we waited.
+        snapshot = _snapshots.get(name)
+        if _is_snapshot_fresh(snapshot, ttl_seconds):
+            return snapshot
+
+        cache_key = f"feed_snapshot:{name}"
+        shared = safe_cache_get(cache_key)
+        if isinstance(shared, dict) and shared.get("data") is not None:
+            fetched_at = int(shared.get("_meta", {}).get("fetched_at") or 0)
+            candidate = build(shared["data"], fetched_at)
+            if _is_snapshot_fresh(candidate, ttl_seconds):
+                _snapshots[name] = candidate
+                return candidate
+            snapshot = snapshot or candidate
+
+        with SourceReservation(source) as reservation:
+            if not reservation:
+                return snapshot
+
+            try:
+                data = download(reservation)
+            except Exception:
+                # Keep serving the previous copy (if any) until the source recovers.
+                return snapshot
+
+        fetched_at = int(time.time())
+        safe_cache_set(cache_key, {"data": data, "_meta": {"fetched_at": fetched_at}}, storage_ttl_seconds)
+        snapshot = build(data, fetched_at)
+        _snapshots[name] = snapshot
+        return snapshot
+
+
+def _build_advisory_snapshot(items, fetched_at):
+    # token -> positions of items whose title/description contain it
+    index = {}
+    for position, item in enumerate(items):
+        for token in set(_tokenize(f"{item['title']} {item['description']}")):
+            index.setdefault(token, set()).add(position)
+    return {"items": items, "index": index, "fetched_at": fetched_at}
+
+
+def _download_advisory_feed(feed, reservation=None):
+    headers = {
+        "Accept": "application/rss+xml, application/xml, text/xml",
+        "User-Agent": "TripBozo/1.0 (travel-updates)",
+    }
+    with open_url(feed["url"], headers=headers, source=feed["name"], reservation=reservation) as response:
+        return list(iter_rss_items(response))
+
+
+def get_feed_snapshot(feed):
+    """Return the parsed snapshot for an advisory feed, downloading it at most once per TTL."""
+    return _get_shared_snapshot(
+        f"gov_advisory:{feed['name']}",
+        feed["name"],
+        GOV_ADVISORY_FEED_TTL,
+        GOV_ADVISORY_FEED_STORAGE_TTL,
+        lambda reservation: _download_advisory_feed(feed, reservation),
+        _build_advisory_snapshot,
+    )
+
+
+def candidate_items(snapshot, terms):
+    """Items whose text contains every token of at least one term (dictionary lookups only)."""
+    if not snapshot:
+        return []
+
+    index = snapshot["index"]
+    positions = set()
+    for term in terms:
+        tokens = _tokenize(term)
+        if not tokens:
+            continue
+        matched = index.get(tokens[0], set())
+        for token in tokens[1:]:
+            if not matched:
+                break
+            matched = matched & index.get(token, set())
+        positions |= matched
+
+    items = snapshot["items"]
+    return [items[position] for position in sorted(positions)]
+
+
+def _geometry_points(geometry):
+    """Yield (lat, lon) pairs for an EONET Point or Polygon geometry."""
+    coordinates = geometry.get("coordinates") or []
+    if geometry.get("type") == "Point":
+        if len(coordinates) >= 2:
+            yield coordinates[1], coordinates[0]
+        return
+    for ring in coordinates:
+        for point in ring or []:
+            if isinstance(point, (list, tuple)) and len(point) >= 2:
+                yield point[1], point[0]
+
+
+def _download_eonet_events(reservation=None):
+    payload = fetch_json(
+        EONET_EVENTS_URL,
+        headers={"Accept": "application/json", "User-Agent": "TripBozo/1.0 (travel-updates)"},
+        source="eonet",
+        reservation=reservation,
+    )
+
+    events = []
+    for event in payload.get("events", [])[:50]:
+        title = str(event.get("title") or "").strip()
+        description = str(event.get("description") or "").strip()
+        if not title and not description:
+            continue
+        geometry = event.get("geometry") or []
+        points = []
+        for entry in geometry:
+            points.extend([lat, lon] for lat, lon in _geometry_points(entry or {}))
+        events.append(
+            {
+                "title": title,
+                "description": description,
+                "link": str(event.get("link") or "https://eonet.gsfc.nasa.gov/").strip(),
+                "date": str((geometry[0] if geometry else {}).get("date") or "").strip(),
+                "categories": [str(cat.get("title") or cat.get("id") or "") for cat in event.get("categories") or []],
+                "points": points,
+            }
+        )
+    return events
+
+
+def _build_eonet_snapshot(events, fetched_at):
+    by_country = {}
+    for event in events:
+        codes = set()
+        for lat, lon in event.get("points") or []:
+            codes |= countries_for_point(lat, lon)
+        for code in codes:
+            by_country.setdefault(code, []).append(event)
+    return {"events": events, "by_country": by_country, "fetched_at": fetched_at}
+
+
+def get_eonet_snapshot():
+    """Return open EONET events indexed by the country codes their geometry falls in."""
+    return _get_shared_snapshot(
+        "eonet",
+        "eonet",
+        EONET_SNAPSHOT_TTL,
+        EONET_SNAPSHOT_STORAGE_TTL,
+        _download_eonet_events,
+        _build_eonet_snapshot,
+    )
@@ -0,0 +1,167 @@
+# country/geo.py
+"""Offline country geometry lookups backed by CountryGeography rows.
+
+The bundled country_geo.csv is the baseline; rows imported with
+``manage.py import_country_geo`` override it. The table is loaded once per
+process, so admin edits take effect on the next restart.
+
+Centroids match the restcountries ``latlng`` values the weather lookup used
+to fetch on every refresh. Bounding boxes come from Natural Earth map
+subunits (public domain), so a country may own several boxes (e.g. mainland
+plus overseas territories).
+"""
+import csv
+import math
+import logging
+import threading
+from pathlib import Path
+
+from django.db import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+
+GEO_CSV_PATH = Path(__file__).resolve().parent / "management" / "commands" / "country_geo.csv"
+
+# Grid cell size (degrees) for the point lookup index.
+GRID_CELL_DEGREES = 10
+
+_load_lock = threading.Lock()
+_geo_table = None
+
+
+def _parse_bounds(raw):
+    boxes = []
+    for chunk in str(raw or "").split(";"):
+        parts = chunk.split()
+        if len(parts) != 4:
+            continue
+        try:
+            min_lon, min_lat, max_lon, max_lat = (float(part) for part in parts)
+        except ValueError:
+            continue
+        boxes.append((min_lon, min_lat, max_lon, max_lat))
+    return boxes
+
+
+def _cells_for_box(box):
+    min_lon, min_lat, max_lon, max_lat = box
+    for x in range(math.floor(min_lon / GRID_CELL_DEGREES), math.floor(max_lon / GRID_CELL_DEGREES) + 1):
+        for y in range(math.floor(min_lat / GRID_CELL_DEGREES), math.floor(max_lat / GRID_CELL_DEGREES) + 1):
+            yield (x, y)
+
+
+def _parse_aliases(raw):
+    return [alias.strip() for alias in str(raw or "").split("|") if alias.strip()]
+
+
+def read_geo_csv(path=GEO_CSV_PATH):
+    """Yield one dict per row of the bundled dataset: code, name, centroid, bounds, aliases."""
+    if not Path(path).exists():
+        return
+
+    with open(path, "r", encoding="utf-8-sig", newline="") as handle:
+        for row in csv.DictReader(handle):
+            code = str(row.get("code") or "").strip().upper()
+            if not code:
+                continue
+            try:
+                centroid = (float(row["latitude"]), float(row["longitude"]))
+            except (KeyError, TypeError, ValueError):
+                centroid = None
+            yield {
+                "code": code,
+                "name": str(row.get("name") or "").strip(),
+                "centroid": centroid,
+                "bounds": _parse_bounds(row.get("bounds")),
+                "aliases": _parse_aliases(row.get("aliases")),
+            }
+
+
+def _load_db_overrides():
+    from .models import CountryGeography
+
+    entries = {}
+    try:
+        rows = CountryGeography.objects.select_related("country").all()
+        for geo in rows:
+            code = str(geo.country.code or "").strip().upper()
+            if not code:
+                continue
+            centroid = None
+            if geo.latitude is not None and geo.longitude is not None:
+                centroid = (geo.latitude, geo.longitude)
+            entries[code] = {
+                "code": code,
+                "name": geo.country.name,
+                "centroid": centroid,
+                "bounds": [tuple(box) for box in (geo.bounds or []) if len(box) == 4],
+                "aliases": [str(alias) for alias in (geo.aliases or []) if str(alias).strip()],
+            }
+    except DatabaseError as exc:
+        # Table not migrated yet; the bundled CSV is still a complete table.
+        logger.warning("Country geography table unavailable, using bundled CSV: %s", exc)
+    return entries
+
+
+def _load_geo_table():
+    countries = {entry["code"]: entry for entry in read_geo_csv()}
+    countries.update(_load_db_overrides())
+
+    grid = {}
+    for code, entry in countries.items():
+        for box in entry["bounds"]:
+            for cell in _cells_for_box(box):
+                grid.setdefault(cell, []).append((box, code))
+
+    return {"countries": countries, "grid": grid}
+
+
+def geo_table():
+    """Return the in-memory geo table, loading it on first use."""
+    global _geo_table
+    if _geo_table is None:
+        with _load_lock:
+            if _geo_table is None:
+                _geo_table = _load_geo_table()
+    return _geo_table
+
+
+def reset_geo_table():
+    """Drop the in-memory table so the next lookup reloads it (after an import or admin edit)."""
+    global _geo_table
+    with _load_lock:
+        _geo_table = None
+
+
+def country_centroid(country_code):
+    """(latitude, longitude) of a country's centroid, or None if unknown."""
+    entry = geo_table()["countries"].get(str(country_code or "").strip().upper())
+    return entry["centroid"] if entry else None
+
+
+def country_bounds(country_code):
+    entry = geo_table()["countries"].get(str(country_code or "").strip().upper())
+    return entry["bounds"] if entry else []
+
+
+def country_aliases(country_code):
+    """Alternative names (formal, native, abbreviations) for a country."""
+    entry = geo_table()["countries"].get(str(country_code or "").strip().upper())
+    return list(entry["aliases"]) if entry else []
+
+
+def countries_for_point(latitude, longitude):
+    """Country codes whose bounding boxes contain the given point."""
+    try:
+        lat = float(latitude)
+        lon = float(longitude)
+    except (TypeError, ValueError):
+        return set()
+
+    cell = (math.floor(lon / GRID_CELL_DEGREES), math.floor(lat / GRID_CELL_DEGREES))
+    matches = set()
+    for (min_lon, min_lat, max_lon, max_lat), code in geo_table()["grid"].get(cell, []):
+        if min_lon <= lon <= max_lon and min_lat <= lat <= max_lat:
+            matches.add(code)
+    return matches
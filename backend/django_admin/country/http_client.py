@@ -0,0 +1,217 @@
+# country/http_client.py
+"""Outbound HTTP helpers shared by the travel-updates and insights fetchers.
+
+All outbound calls go through one pooled keep-alive ``requests`` session, so
+repeated calls to the same host (e.g. open-meteo) reuse a warm connection.
+
+Responses that carry an ETag or Last-Modified header are stored (validators
+plus body) in the Django cache per URL. The next request sends
+If-None-Match / If-Modified-Since, and a 304 is replayed from the stored body
+so unchanged feeds cost no bandwidth and don't count against source caps.
+
+Calls tagged with a ``source`` go through that source's circuit breaker
+(see sources.py): while it is open they raise SourceUnavailable immediately
+instead of waiting out a timeout.
+"""
+import hashlib
+import io
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.core.cache import cache
+
+from urllib3.exceptions import HTTPError as Urllib3Error
+
+from .sources import (
+    SourceUnavailable,
+    record_source_failure,
+    record_source_success,
+    source_available,
+)
+
+logger = logging.getLogger(__name__)
+
+OUTBOUND_USER_AGENT = "TripBozo/1.0"
+OUTBOUND_DEFAULT_TIMEOUT = 8
+# Connections kept alive per host. Bursts beyond this (e.g. a batch refresh
+# fanning out to Google News) open extra connections that are closed after
+# use, rather than queueing for a pooled one with no timeout.
+OUTBOUND_MAX_CONNECTIONS_PER_HOST = 8
+OUTBOUND_MAX_POOLED_HOSTS = 32
+
+CONDITIONAL_CACHE_TTL = 24 * 60 * 60
+CONDITIONAL_CACHE_MAX_BYTES = 2 * 1024 * 1024
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Process-wide pooled session (created lazily, after gunicorn forks)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=OUTBOUND_MAX_POOLED_HOSTS,
+                    pool_maxsize=OUTBOUND_MAX_CONNECTIONS_PER_HOST,
+                    pool_block=False,
+                    max_retries=0,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["User-Agent"] = OUTBOUND_USER_AGENT
+                _session = session
+    return _session
+
+
+def _validator_key(url):
+    return "http_validators:" + hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def _load_validators(url):
+    try:
+        entry = cache.get(_validator_key(url))
+    except Exception:
+        return None
+    if isinstance(entry, dict) and isinstance(entry.get("body"), bytes):
+        return entry
+    return None
+
+
+def _store_validators(url, etag, last_modified, body):
+    if not (etag or last_modified) or len(body) > CONDITIONAL_CACHE_MAX_BYTES:
+        return
+    entry = {
+        "etag": etag,
+        "last_modified": last_modified,
+        "body": body,
+        "stored_at": int(time.time()),
+    }
+    try:
+        cache.set(_validator_key(url), entry, CONDITIONAL_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"Could not store validators for {url}: {e}")
+
+
+class _ResponseStream:
+    """File-like view over a streamed response that yields decoded bytes."""
+
+    def __init__(self, response, source=None):
+        self._raw = response.raw
+        self._source = source
+
+    def read(self, size=-1):
+        try:
+            if size is None or size < 0:
+                return self._raw.read(decode_content=True)
+            return self._raw.read(size, decode_content=True)
+        except Urllib3Error:
+            # Connection dropped or stalled mid-body.
+            record_source_failure(self._source)
+            raise
+
+
+class _RecordingStream:
+    """Wraps a stream and hands the full body to ``on_complete`` once EOF is reached.
+
+    If the caller stops reading early (e.g. a streaming parser that has
+    enough items) the body is incomplete and nothing is recorded; such
+    callers should pass ``conditional=False`` to open_url.
+    """
+
+    def __init__(self, stream, on_complete):
+        self._stream = stream
+        self._on_complete = on_complete
+        self._chunks = []
+        self._finished = False
+
+    def read(self, size=-1):
+        data = self._stream.read(size)
+        if self._finished:
+            return data
+        if data:
+            self._chunks.append(data)
+        if not data or size is None or size < 0:
+            self._finished = True
+            self._on_complete(b"".join(self._chunks))
+        return data
+
+
+@contextmanager
+def open_url(
+    url, headers=None, timeout=OUTBOUND_DEFAULT_TIMEOUT, source=None, conditional=True, reservation=None,
+):
+    """Open ``url`` on the pooled session and yield a readable stream.
+
+    Any stored copy is revalidated first. ``source`` names the circuit
+    breaker the call reports to. ``reservation`` is the caller's
+    SourceReservation for that source's hourly cap: any request that reaches
+    the source and isn't answered 304 marks it spent, so its owner hands it
+    back once if none did.
+    Non-2xx responses raise ``requests.HTTPError``; an open circuit raises
+    SourceUnavailable, leaving the reservation for its owner to return.
+    """
+    if not source_available(source):
+        raise SourceUnavailable(source)
+
+    request_headers = dict(headers or {})
+    stored = _load_validators(url) if conditional else None
+    if stored:
+        if stored.get("etag"):
+            request_headers["If-None-Match"] = stored["etag"]
+        if stored.get("last_modified"):
+            request_headers["If-Modified-Since"] = stored["last_modified"]
+
+    started = time.monotonic()
+    try:
+        response = get_session().get(url, headers=request_headers, timeout=timeout, stream=True)
+    except requests.RequestException:
+        if reservation is not None:
+            reservation.spent = True
+        record_source_failure(source)
+        raise
+    # A 304 replayed from the stored body costs the source nothing.
+    if reservation is not None and not (response.status_code == 304 and stored):
+        reservation.spent = True
+
+    # Rate limiting and server errors mean the source is struggling; other
+    # 4xx answers (e.g. an unknown country code) mean it is healthy.
+    if response.status_code == 429 or response.status_code >= 500:
+        record_source_failure(source)
+    else:
+        record_source_success(source, time.monotonic() - started)
+
+    with response:
+        if response.status_code == 304 and stored:
+            yield io.BytesIO(stored["body"])
+            return
+
+        response.raise_for_status()
+        stream = _ResponseStream(response, source)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if conditional and (etag or last_modified):
+            yield _RecordingStream(stream, lambda body: _store_validators(url, etag, last_modified, body))
+        else:
+            yield stream
+
+
+def fetch_bytes(url, headers=None, timeout=OUTBOUND_DEFAULT_TIMEOUT, source=None, conditional=True, reservation=None):
+    """GET ``url`` and return the whole body."""
+    with open_url(
+        url, headers=headers, timeout=timeout, source=source, conditional=conditional, reservation=reservation,
+    ) as response:
+        return response.read()
+
+
+def fetch_json(url, headers=None, timeout=OUTBOUND_DEFAULT_TIMEOUT, source=None, reservation=None):
+    """GET ``url`` (conditionally, when possible) and decode the JSON body."""
+    body = fetch_bytes(url, headers=headers, timeout=timeout, source=source, reservation=reservation)
+    return json.loads(body.decode("utf-8", errors="ignore"))
@@ -0,0 +1,88 @@
+import pickle
+import time
+
+from django.core.management.base import BaseCommand
+
+from country.models import Country, TravelApp
+from country.views import _build_country_apps, _build_country_essentials, _build_country_page
+from personalized_list.serializers import TravelAppSerializer
+from services import codec
+
+
+def _variants():
+    """name -> (encode, decode) for every codec combination installed here."""
+    json_name = "orjson" if codec.orjson is not None else "json"
+    variants = {
+        "pickle": (
+            lambda value: pickle.dumps(value, pickle.DEFAULT_PROTOCOL),
+            pickle.loads,
+        ),
+        json_name: (codec.json_dumps, codec.json_loads),
+    }
+    for name in codec.CODECS:
+        variants[f"pickle+{name}"] = (
+            lambda value, name=name: codec.compress(pickle.dumps(value, pickle.DEFAULT_PROTOCOL), min_bytes=0, codec=name),
+            lambda data: pickle.loads(codec.decompress(data)),
+        )
+        variants[f"{json_name}+{name}"] = (
+            lambda value, name=name: codec.compress(codec.json_dumps(value), min_bytes=0, codec=name),
+            lambda data: codec.json_loads(codec.decompress(data)),
+        )
+    return variants
+
+
+class Command(BaseCommand):
+    help = "Compare size and encode/decode time of cache codecs on real country and session payloads"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--countries", type=int, default=10, help="Countries to sample payloads from")
+        parser.add_argument("--iterations", type=int, default=50, help="Encode/decode rounds per payload")
+
+    def handle(self, *args, **options):
+        codes = list(Country.objects.order_by("code").values_list("code", flat=True)[: options["countries"]])
+        if not codes:
+            self.stderr.write("❌ No countries in the database to sample")
+            return
+
+        # Build straight from the DB (bypassing the cache wrappers).
+        payloads = {
+            "country_page": [_build_country_page.__wrapped__(code) for code in codes],
+            "country_apps": [_build_country_apps.__wrapped__(code) for code in codes],
+            "country_essentials": [_build_country_essentials.__wrapped__(code) for code in codes],
+        }
+        session_apps = TravelApp.objects.filter(country__code__in=codes).order_by("id")[:10]
+        payloads["personal_list_session"] = [TravelAppSerializer(session_apps, many=True).data]
+
+        # The cache stores plain dicts/lists; drop DRF's ReturnDict wrappers.
+        payloads = {kind: [codec.json_loads(codec.json_dumps(item)) for item in items] for kind, items in payloads.items()}
+
+        iterations = max(1, options["iterations"])
+        variants = _variants()
+        self.stdout.write(f"Codecs installed: {', '.join(codec.CODECS)}; {iterations} rounds per payload\n")
+
+        for kind, items in payloads.items():
+            self.stdout.write(f"\n{kind} ({len(items)} payloads)")
+            self.stdout.write(f"  {'codec':<16}{'avg bytes':>12}{'encode µs':>12}{'decode µs':>12}")
+            for name, (encode, decode) in variants.items():
+                total_bytes = 0
+                encode_seconds = 0.0
+                decode_seconds = 0.0
+                for item in items:
+                    started = time.perf_counter()
+                    for _ in range(iterations):
+                        blob = encode(item)
+                    encode_seconds += time.perf_counter() - started
+
+                    started = time.perf_counter()
+                    for _ in range(iterations):
+                        decode(blob)
+                    decode_seconds += time.perf_counter() - started
+                    total_bytes += len(blob)
+
+                rounds = iterations * len(items)
+                self.stdout.write(
+                    f"  {name:<16}{total_bytes // len(items):>12}"
+                    f"{encode_seconds / rounds * 1e6:>12.1f}{decode_seconds / rounds * 1e6:>12.1f}"
+                )
+
+        self.stdout.write(self.style.SUCCESS(f"\n✅ Cache writes use: {codec.compression_name() or 'no compression'} above {codec.COMPRESSION_MIN_BYTES} bytes"))
@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from country import fast_serializers
+from country.models import Country, TravelApp
+from country.serializers import CountrySerializer, EssentialsSerializer, TravelAppSerializer
+from country.views import _serialize_country_page
+
+
+def _cases(countries):
+    """name -> (drf, fast) zero-arg callables serializing every sampled country."""
+    def apps_qs(country):
+        return TravelApp.objects.filter(country=country).order_by("-is_sponsored", "name")
+
+    codes = [country.code for country in countries]
+    return {
+        "country_apps": (
+            lambda: [TravelAppSerializer(TravelAppSerializer.prefetch(apps_qs(c)), many=True).data for c in countries],
+            lambda: [fast_serializers.serialize_travel_apps(apps_qs(c)) for c in countries],
+        ),
+        "country_page": (
+            lambda: [_serialize_country_page(c) for c in countries],
+            lambda: [fast_serializers.serialize_country_page(c) for c in countries],
+        ),
+        "country_essentials": (
+            lambda: [EssentialsSerializer(c).data for c in countries],
+            lambda: [fast_serializers.serialize_essentials(c) for c in countries],
+        ),
+        "homepage_countries": (
+            lambda: CountrySerializer(Country.objects.filter(code__in=codes), many=True).data,
+            lambda: fast_serializers.serialize_countries(Country.objects.filter(code__in=codes)),
+        ),
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare DRF serializers with country/fast_serializers.py on real country data"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--countries", type=int, default=10, help="Countries to sample")
+        parser.add_argument("--iterations", type=int, default=20, help="Rounds per serializer")
+
+    def handle(self, *args, **options):
+        countries = list(Country.objects.order_by("code")[: options["countries"]])
+        if not countries:
+            self.stderr.write("❌ No countries in the database to sample")
+            return
+
+        iterations = max(1, options["iterations"])
+        self.stdout.write(f"{len(countries)} countries, {iterations} rounds each\n")
+        self.stdout.write(f"  {'payload':<20}{'drf ms':>10}{'fast ms':>10}{'speedup':>10}{'queries':>12}")
+        for name, (drf, fast) in _cases(countries).items():
+            timings = []
+            query_counts = []
+            for serialize in (drf, fast):
+                with CaptureQueriesContext(connection) as queries:
+                    serialize()
+                query_counts.append(len(queries))
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    serialize()
+                timings.append((time.perf_counter() - started) / iterations * 1000)
+            self.stdout.write(
+                f"  {name:<20}{timings[0]:>10.2f}{timings[1]:>10.2f}{timings[0] / timings[1]:>9.1f}x"
+                f"{f'{query_counts[0]} → {query_counts[1]}':>12}"
+            )
+
+        state = "on" if fast_serializers.enabled() else "off"
+        self.stdout.write(self.style.SUCCESS(f"\n✅ FAST_SERIALIZERS is {state}"))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from country.geo import GEO_CSV_PATH, read_geo_csv, reset_geo_table
+from country.matching import get_country_matcher
+from country.models import Country, CountryGeography
+
+
+class Command(BaseCommand):
+    help = "Import country centroids, bounding boxes and aliases from country_geo.csv"
+
+    def handle(self, *args, **options):
+        if not GEO_CSV_PATH.exists():
+            self.stderr.write(f"❌ CSV not found: {GEO_CSV_PATH}")
+            return
+
+        rows = {row["code"]: row for row in read_geo_csv()}
+        countries = Country.objects.filter(code__in=list(rows.keys()))
+
+        created = updated = 0
+        with transaction.atomic():
+            for country in countries:
+                row = rows[country.code.upper()]
+                centroid = row["centroid"] or (None, None)
+                _, was_created = CountryGeography.objects.update_or_create(
+                    country=country,
+                    defaults={
+                        "latitude": centroid[0],
+                        "longitude": centroid[1],
+                        "bounds": [list(box) for box in row["bounds"]],
+                        "aliases": row["aliases"],
+                    },
+                )
+                if was_created:
+                    created += 1
+                else:
+                    updated += 1
+
+        reset_geo_table()
+        get_country_matcher.cache_clear()
+
+        missing = Country.objects.exclude(code__in=list(rows.keys())).values_list("code", flat=True)
+        for code in missing:
+            self.stderr.write(f"⚠️ No geography row for {code}")
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Country geography imported: {created} created, {updated} updated"))
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from country.tasks import WARMUP_BUILDERS, WARMUP_WORKERS, warm_country_caches
+
+
+class Command(BaseCommand):
+    help = "Precompute cached page, apps, essentials and services payloads for every country"
+
+    def add_arguments(self, parser):
+        parser.add_argument("codes", nargs="*", help="Country codes to warm (default: all)")
+        parser.add_argument(
+            "--sections", nargs="+", choices=list(WARMUP_BUILDERS), default=list(WARMUP_BUILDERS),
+            help="Payload sections to warm",
+        )
+        parser.add_argument("--only-missing", action="store_true", help="Skip payloads that are already cached")
+        parser.add_argument("--workers", type=int, default=WARMUP_WORKERS, help="Countries built in parallel")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        stats = warm_country_caches(
+            codes=options["codes"] or None,
+            sections=options["sections"],
+            only_missing=options["only_missing"],
+            workers=options["workers"],
+        )
+
+        for section, result in stats.items():
+            line = (
+                f"{section:<12} warmed {result['warmed']:>4}  skipped {result['skipped']:>4}  "
+                f"build {result['build_seconds']:>7.2f}s  write {result['write_seconds']:>6.2f}s"
+            )
+            if result["failed"]:
+                self.stdout.write(self.style.WARNING(f"⚠️ {line}  failed {result['failed']}"))
+            else:
+                self.stdout.write(f"✅ {line}")
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Cache warm-up done in {time.perf_counter() - started:.2f}s"))
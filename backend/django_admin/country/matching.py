@@ -0,0 +1,88 @@
+# country/matching.py
+"""Country alias matching used for travel-updates relevance scoring."""
+import re
+from functools import lru_cache
+
+from .geo import country_aliases
+
+
+COUNTRY_ALIAS_MAP = {
+    "united states": ["usa", "u.s.", "us", "america", "united states"],
+    "united kingdom": ["uk", "u.k.", "britain", "great britain", "united kingdom"],
+    "south korea": ["korea", "republic of korea", "south korea"],
+    "north korea": ["dprk", "north korea"],
+    "united arab emirates": ["uae", "u.a.e.", "emirates", "united arab emirates"],
+    "czech republic": ["czechia", "czech republic"],
+    "ivory coast": ["cote d'ivoire", "ivory coast"],
+}
+
+
+def _phrase_pattern(phrase):
+    parts = [re.escape(part) for part in str(phrase).strip().split() if part]
+    if not parts:
+        return None
+    separator = r"\s+"
+    return separator.join(parts)
+
+
+def _append_unique(terms, seen, term):
+    key = str(term).strip().lower()
+    if key and key not in seen:
+        seen.add(key)
+        terms.append(term)
+
+
+def _short_focus_terms(country_name, country_code=None):
+    terms = []
+    seen = set()
+    _append_unique(terms, seen, str(country_name).strip())
+
+    for alias in COUNTRY_ALIAS_MAP.get(str(country_name).strip().lower(), []):
+        _append_unique(terms, seen, alias)
+
+    if country_code:
+        _append_unique(terms, seen, str(country_code).strip().lower())
+
+    return terms
+
+
+def country_focus_terms(country_name, country_code=None):
+    terms = _short_focus_terms(country_name, country_code)
+    seen = {term.lower() for term in terms}
+    # Formal / native names from the local geography table.
+    for alias in country_aliases(country_code):
+        _append_unique(terms, seen, alias)
+    return terms
+
+
+def country_terms_with_aliases(country_name, country_code=None):
+    expanded = country_focus_terms(country_name, country_code)
+    seen = {term.lower() for term in expanded}
+    # Only split the short names: parts of formal names ("Republic", "of")
+    # would match almost any article.
+    for term in _short_focus_terms(country_name, country_code):
+        for part in str(term).replace("/", " ").replace("-", " ").split():
+            if len(part) > 2:
+                _append_unique(expanded, seen, part)
+    return expanded
+
+
+class CountryMatcher:
+    """Single precompiled alternation over every alias of one country."""
+
+    def __init__(self, terms):
+        self.terms = tuple(terms)
+        # Longest first so multi-word aliases win over their own parts.
+        patterns = [p for p in (_phrase_pattern(t) for t in sorted(self.terms, key=len, reverse=True)) if p]
+        self._regex = re.compile(rf"\b(?:{'|'.join(patterns)})\b", re.IGNORECASE) if patterns else None
+
+    def search(self, text):
+        if self._regex is None:
+            return False
+        return self._regex.search(str(text or "")) is not None
+
+
+@lru_cache(maxsize=512)
+def get_country_matcher(country_name, country_code=None):
+    """Memoized matcher for a country's name, aliases, code and name parts."""
+    return CountryMatcher(country_terms_with_aliases(country_name, country_code))
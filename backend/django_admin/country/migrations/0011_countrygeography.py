@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('country', '0010_countryserviceprovider'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CountryGeography',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('latitude', models.FloatField(blank=True, null=True)),
+                ('longitude', models.FloatField(blank=True, null=True)),
+                ('bounds', models.JSONField(blank=True, default=list)),
+                ('aliases', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('country', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='geography', to='country.country')),
+            ],
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('country', '0011_countrygeography'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CountrySnapshot',
+            fields=[
+                ('code', models.CharField(max_length=10, primary_key=True, serialize=False)),
+                ('data', models.JSONField(default=dict)),
+                ('payload', models.BinaryField(default=b'')),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('built_version', models.PositiveIntegerField(blank=True, null=True)),
+                ('built_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
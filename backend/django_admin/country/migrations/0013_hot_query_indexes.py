@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('country', '0012_countrysnapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='countryserviceprovider',
+            index=models.Index(fields=['country', 'section', '-is_featured', 'name'], name='service_country_section_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='countryvisit',
+            index=models.Index(fields=['-visit_count'], name='countryvisit_popular_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='travelapp',
+            index=models.Index(fields=['country', '-is_sponsored', 'name'], name='travelapp_country_listing_idx'),
+        ),
+    ]
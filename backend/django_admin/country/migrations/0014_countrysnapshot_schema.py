@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('country', '0013_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='countrysnapshot',
+            name='schema',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
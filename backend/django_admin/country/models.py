@@ -11,11 +11,33 @@ class Country(models.Model):
         return self.name
 
 
+class CountryGeography(models.Model):
+    """
+    Static centroid, bounding boxes and name aliases for a country.
+    Populated by the import_country_geo command from country_geo.csv.
+    """
+    country = models.OneToOneField(Country, on_delete=models.CASCADE, related_name="geography")
+    latitude = models.FloatField(blank=True, null=True)
+    longitude = models.FloatField(blank=True, null=True)
+    bounds = models.JSONField(default=list, blank=True)   # [[min_lon, min_lat, max_lon, max_lat], ...]
+    aliases = models.JSONField(default=list, blank=True)  # alternative names used for news matching
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.country.code} geography"
+
+
 class CountryVisit(models.Model):
     country = models.OneToOneField(Country, on_delete=models.CASCADE, related_name="visit_stats")
     visit_count = models.PositiveIntegerField(default=0)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Popular countries: most visited first.
+            models.Index(fields=["-visit_count"], name="countryvisit_popular_idx"),
+        ]
+
     def __str__(self):
         return f"{self.country.code}: {self.visit_count} visits"
 
@@ -60,6 +82,10 @@ class TravelApp(models.Model):
     
     class Meta:
         unique_together = ('name', 'country')  # Ensure app names are unique **per country**
+        indexes = [
+            # Country app list: filter by country, sponsored first, then by name.
+            models.Index(fields=["country", "-is_sponsored", "name"], name="travelapp_country_listing_idx"),
+        ]
 
 
 class CountryServiceProvider(models.Model):
@@ -84,6 +110,10 @@ class CountryServiceProvider(models.Model):
     class Meta:
         unique_together = ("country", "section", "name")
         ordering = ("country__name", "section", "-is_featured", "name")
+        indexes = [
+            # Services page: one country's providers by section, featured first.
+            models.Index(fields=["country", "section", "-is_featured", "name"], name="service_country_section_idx"),
+        ]
 
     def __str__(self):
         return f"{self.country.code}: {self.section} / {self.name}"
@@ -164,4 +194,30 @@ class OriginCountryAssistance(models.Model):
     fetched_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.country.code} assistance"
\ No newline at end of file
+        return f"{self.country.code} assistance"
+
+class CountrySnapshot(models.Model):
+    """
+    Materialized country page payload, rebuilt whenever the rows it is built from change.
+    Keyed by country code so a cold page read is one primary-key lookup.
+    ``version`` is bumped on every change; the snapshot is current while ``built_version`` matches it
+    and it was built with the current ``SCHEMA``.
+    """
+    # Bump whenever the page payload shape changes, so snapshots built by the
+    # previous release are rebuilt instead of served.
+    SCHEMA = 1
+
+    code = models.CharField(max_length=10, primary_key=True)
+    data = models.JSONField(default=dict)
+    payload = models.BinaryField(default=b"")  # ``data`` as compact JSON, compressed (services/codec.py)
+    version = models.PositiveIntegerField(default=0)
+    built_version = models.PositiveIntegerField(null=True, blank=True)
+    built_at = models.DateTimeField(null=True, blank=True)
+    schema = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.code} snapshot"
+
+    @property
+    def is_current(self):
+        return self.built_version == self.version and self.schema == self.SCHEMA
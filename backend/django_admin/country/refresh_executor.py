@@ -0,0 +1,146 @@
+# country/refresh_executor.py
+"""Per-process bounded pool for background cache refreshes.
+
+A fixed number of worker threads serve a priority queue, so refresh
+concurrency and memory stay flat however many payloads go stale at once.
+Tasks are keyed by cache key: a key that is already queued or running is
+not queued again. Jitter is a scheduled start time rather than a sleeping
+worker. On interpreter exit the queue is drained for a short grace period.
+"""
+import atexit
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 0     # refreshes triggered by a visitor reading a stale payload
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 10     # pre-warming / batch work
+
+REFRESH_WORKERS = 4
+REFRESH_MAX_QUEUED = 256
+REFRESH_DRAIN_SECONDS = 10
+
+
+class RefreshExecutor:
+    def __init__(self, workers=REFRESH_WORKERS, max_queued=REFRESH_MAX_QUEUED):
+        self.workers = workers
+        self.max_queued = max_queued
+        self._cond = threading.Condition()
+        self._ready = []      # (priority, seq, key, fn)
+        self._delayed = []    # (run_at, priority, seq, key, fn)
+        self._keys = set()    # queued or running
+        self._running = 0
+        self._seq = itertools.count()
+        self._threads = []
+        self._accepting = True
+        self._stats = {"submitted": 0, "deduplicated": 0, "rejected": 0, "completed": 0, "failed": 0, "max_depth": 0}
+
+    def submit(self, key, fn, priority=PRIORITY_NORMAL, delay=0):
+        """Queue ``fn`` under ``key``; False if the key is already pending or the queue is full."""
+        with self._cond:
+            if not self._accepting:
+                self._stats["rejected"] += 1
+                return False
+            if key in self._keys:
+                self._stats["deduplicated"] += 1
+                return False
+            if len(self._ready) + len(self._delayed) >= self.max_queued:
+                self._stats["rejected"] += 1
+                logger.warning(f"Refresh queue full ({self.max_queued}); dropping {key}")
+                return False
+
+            self._ensure_workers()
+            seq = next(self._seq)
+            if delay > 0:
+                heapq.heappush(self._delayed, (time.monotonic() + delay, priority, seq, key, fn))
+            else:
+                heapq.heappush(self._ready, (priority, seq, key, fn))
+            self._keys.add(key)
+            self._stats["submitted"] += 1
+            self._stats["max_depth"] = max(self._stats["max_depth"], len(self._ready) + len(self._delayed))
+            self._cond.notify()
+            return True
+
+    def metrics(self):
+        with self._cond:
+            return {
+                "queued": len(self._ready),
+                "scheduled": len(self._delayed),
+                "running": self._running,
+                "workers": len(self._threads),
+                **self._stats,
+            }
+
+    def shutdown(self, timeout=REFRESH_DRAIN_SECONDS):
+        """Stop accepting work and give queued refreshes ``timeout`` seconds to finish."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._accepting = False
+            # Jitter no longer matters; run everything that is left now.
+            while self._delayed:
+                _, priority, seq, key, fn = heapq.heappop(self._delayed)
+                heapq.heappush(self._ready, (priority, seq, key, fn))
+            self._cond.notify_all()
+            while (self._ready or self._running) and self._threads:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            dropped = len(self._ready)
+            self._cond.notify_all()
+        if dropped:
+            logger.warning(f"Refresh executor shut down with {dropped} refreshes still queued")
+
+    def _ensure_workers(self):
+        # Started lazily so threads are created after gunicorn forks.
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"cache-refresh-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _next_task(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                while self._delayed and self._delayed[0][0] <= now:
+                    _, priority, seq, key, fn = heapq.heappop(self._delayed)
+                    heapq.heappush(self._ready, (priority, seq, key, fn))
+                if self._ready:
+                    _, _, key, fn = heapq.heappop(self._ready)
+                    self._running += 1
+                    return key, fn
+                if not self._accepting:
+                    return None
+                timeout = self._delayed[0][0] - now if self._delayed else None
+                self._cond.wait(timeout)
+
+    def _work(self):
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            key, fn = task
+            failed = False
+            try:
+                fn()
+            except Exception:
+                failed = True
+                logger.debug(f"Background refresh failed for {key}", exc_info=True)
+            finally:
+                connection.close()
+                with self._cond:
+                    self._running -= 1
+                    self._keys.discard(key)
+                    self._stats["failed" if failed else "completed"] += 1
+                    self._cond.notify_all()
+
+
+refresh_executor = RefreshExecutor()
+atexit.register(refresh_executor.shutdown)
@@ -0,0 +1,127 @@
+# country/responses.py
+"""Conditional (ETag / 304) responses for the cacheable read-only endpoints.
+
+ETags come from the SWR envelopes (see swr.entry_etag), so they cost nothing
+per request; a matching If-None-Match gets an empty 304 and the payload is
+never rendered.
+
+Envelopes built with ``prerender=True`` also hold the JSON body already
+rendered and compressed (``render_bodies``); those are sent as is, picking
+the variant from Accept-Encoding.
+"""
+import gzip
+import hashlib
+
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Browsers revalidate after a minute; shared caches (CDN) keep a response a
+# little longer and may serve it stale while they revalidate.
+BROWSER_MAX_AGE = 60
+SHARED_MAX_AGE = 5 * 60
+STALE_WHILE_REVALIDATE = 10 * 60
+
+# Bodies are compressed once per build, but builds can run inline on a cache
+# miss: brotli 11 costs ~800ms on a large country page, 5 a few milliseconds
+# for only a slightly larger body.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Server preference when the client accepts several encodings equally.
+ENCODING_PREFERENCE = ("br", "gzip", "identity")
+
+
+def render_bodies(data):
+    """``data`` rendered as DRF would send it, plus gzip and (if installed) brotli variants."""
+    # The default (JSON) renderer, i.e. the one a live response would use.
+    body = api_settings.DEFAULT_RENDERER_CLASSES[0]().render(data)
+    bodies = {"identity": body, "gzip": gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        bodies["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return bodies
+
+
+def _accepted_encodings(request):
+    """{encoding: q} from Accept-Encoding; identity is acceptable unless refused."""
+    accepted = {"identity": 0.001}
+    for part in request.META.get("HTTP_ACCEPT_ENCODING", "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name] = q
+    if "*" in accepted:
+        for name in ENCODING_PREFERENCE:
+            accepted.setdefault(name, accepted["*"])
+    return accepted
+
+
+def _choose_encoding(request, available):
+    accepted = _accepted_encodings(request)
+    candidates = [name for name in ENCODING_PREFERENCE if name in available and accepted.get(name, 0) > 0]
+    if not candidates:
+        return "identity"
+    return max(candidates, key=lambda name: accepted[name])
+
+
+def _prerendered_response(request, bodies):
+    encoding = _choose_encoding(request, bodies)
+    response = HttpResponse(bodies[encoding], content_type="application/json")
+    if encoding != "identity":
+        response["Content-Encoding"] = encoding
+    return response
+
+
+def combine_etags(*parts):
+    """One ETag for a response built from several cached parts or other varying inputs."""
+    return hashlib.blake2b("|".join(str(part) for part in parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _client_has(request, quoted_etag):
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    candidates = parse_etags(header)
+    # If-None-Match uses weak comparison.
+    return "*" in candidates or any(candidate.removeprefix("W/") == quoted_etag for candidate in candidates)
+
+
+def conditional_response(request, etag, body, bodies=None, max_age=BROWSER_MAX_AGE, shared_max_age=SHARED_MAX_AGE):
+    """Response for ``body()`` tagged with ``etag``, or a bodiless 304 if the client already has it.
+
+    ``body`` is only called when the payload is actually sent. ``bodies``
+    (from render_bodies) replaces it for JSON clients.
+    """
+    quoted = f'"{etag}"'
+    accepted_renderer = getattr(request, "accepted_renderer", None)
+    if _client_has(request, quoted):
+        response = Response(status=304)
+    elif bodies and getattr(accepted_renderer, "format", None) == "json" and "indent" not in request.accepted_media_type:
+        response = _prerendered_response(request, bodies)
+    else:
+        response = Response(body())
+    # Encoded variants share the content hash, so the ETag is weak for them.
+    response["ETag"] = f"W/{quoted}" if response.has_header("Content-Encoding") else quoted
+    patch_vary_headers(response, ("Accept-Encoding",))
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=max_age,
+        s_maxage=shared_max_age,
+        stale_while_revalidate=STALE_WHILE_REVALIDATE,
+    )
+    return response
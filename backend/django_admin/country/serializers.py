@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 from .models import Country, TravelApp, AppCategory, Review, AppScreenshot, EmergencyContact, LocalPhrase, UsefulTip, CountryServiceProvider
 
@@ -16,6 +17,14 @@ class TravelAppSerializer(serializers.ModelSerializer):
             "download": obj.get_download_url(),
         }
 
+    @staticmethod
+    def prefetch(queryset):
+        """Eager-load every relation this serializer reads (one query per relation, not per app)."""
+        return queryset.select_related("category").prefetch_related(
+            Prefetch("screenshots", queryset=AppScreenshot.objects.only("id", "app_id").order_by("id")),
+            Prefetch("reviews", queryset=Review.objects.only("id", "app_id").order_by("id")),
+        )
+
 class AppCategorySerializer(serializers.ModelSerializer):
     apps = serializers.SerializerMethodField()
 
@@ -24,11 +33,14 @@ class AppCategorySerializer(serializers.ModelSerializer):
         fields = ['name', 'apps']
 
     def get_apps(self, category):
-        # Prefer the prefetched list 'apps_for_country' if it exists,
+        # Prefer a prefetched list ('apps_for_country' on the country page,
+        # 'category_apps' on the categories list) if it exists,
         # otherwise fall back to the default related manager.
         apps_qs = getattr(category, 'apps_for_country', None)
         if apps_qs is None:
-            apps_qs = category.apps.all().select_related('category')
+            apps_qs = getattr(category, 'category_apps', None)
+        if apps_qs is None:
+            apps_qs = TravelAppSerializer.prefetch(category.apps.all())
         return TravelAppSerializer(apps_qs, many=True).data
 
 class CountrySerializer(serializers.ModelSerializer):
@@ -0,0 +1,143 @@
+# country/signals.py
+"""Evict cached country payloads when the rows they are built from change.
+
+Covers saves and deletes from the Django admin, AdminRecordIngestView and
+import commands. Bulk ``QuerySet.update()`` bypasses signals; call
+``invalidate_country_caches`` directly after those.
+"""
+import logging
+
+from django.db import DatabaseError, transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import (
+    AppCategory, AppScreenshot, Country, CountryServiceProvider, EmergencyContact,
+    LocalPhrase, OriginCountryAssistance, Review, TravelApp, UsefulTip,
+)
+from .snapshots import mark_country_snapshots_stale
+from .utils import COUNTRY_PAYLOAD_KEYS, invalidate_country_caches
+
+logger = logging.getLogger(__name__)
+
+
+# Payload sections each model feeds (see COUNTRY_PAYLOAD_KEYS).
+COUNTRY_SCOPED_SECTIONS = {
+    TravelApp: ("page", "apps"),
+    EmergencyContact: ("essentials",),
+    LocalPhrase: ("essentials",),
+    UsefulTip: ("essentials",),
+    CountryServiceProvider: ("services",),
+    OriginCountryAssistance: ("origin_assistance",),
+}
+APP_SCOPED_SECTIONS = {
+    AppScreenshot: ("page", "apps"),
+    Review: ("page", "apps"),
+}
+
+
+def _schedule(codes, sections):
+    codes = {str(code).upper() for code in codes if code}
+    if not codes:
+        return
+
+    def _invalidate():
+        rebuild_snapshots = "page" in sections
+        # Snapshots go stale before the cache is dropped: a page miss in between
+        # would otherwise re-cache the old snapshot for the full storage TTL.
+        if rebuild_snapshots:
+            mark_country_snapshots_stale(codes)
+        for code in codes:
+            invalidate_country_caches(code, sections)
+        if rebuild_snapshots:
+            _refresh_snapshots(codes)
+
+    # After commit, so a concurrent request can't re-cache the old rows.
+    transaction.on_commit(_invalidate)
+
+
+def _refresh_snapshots(codes):
+    from .refresh_executor import PRIORITY_NORMAL, refresh_executor
+    from .views import refresh_country_snapshot
+
+    for code in codes:
+        # A rebuild skipped here (queue full, or already running on older rows)
+        # leaves the snapshot stale; the next page miss then rebuilds it inline.
+        refresh_executor.submit(
+            f"country_snapshot:{code}", lambda code=code: refresh_country_snapshot(code), priority=PRIORITY_NORMAL
+        )
+
+
+def _codes_for_country_ids(country_ids):
+    ids = [country_id for country_id in country_ids if country_id]
+    if not ids:
+        return []
+    return list(Country.objects.filter(pk__in=ids).values_list("code", flat=True))
+
+
+@receiver(pre_save, sender=Country)
+def _remember_country_code(sender, instance, **kwargs):
+    if instance.pk:
+        instance._cached_old_code = Country.objects.filter(pk=instance.pk).values_list("code", flat=True).first()
+
+
+@receiver(post_save, sender=Country)
+@receiver(post_delete, sender=Country)
+def _invalidate_country(sender, instance, **kwargs):
+    _schedule({instance.code, getattr(instance, "_cached_old_code", None)}, tuple(COUNTRY_PAYLOAD_KEYS))
+
+
+def _remember_country_id(sender, instance, **kwargs):
+    if instance.pk:
+        instance._cached_old_country_id = sender.objects.filter(pk=instance.pk).values_list("country_id", flat=True).first()
+
+
+def _invalidate_country_scoped(sender, instance, **kwargs):
+    country_ids = {instance.country_id, getattr(instance, "_cached_old_country_id", None)}
+    _schedule(_codes_for_country_ids(country_ids), COUNTRY_SCOPED_SECTIONS[sender])
+
+
+def _invalidate_app_scoped(sender, instance, **kwargs):
+    country_ids = TravelApp.objects.filter(pk=instance.app_id).values_list("country_id", flat=True)
+    _schedule(_codes_for_country_ids(list(country_ids)), APP_SCOPED_SECTIONS[sender])
+
+
+@receiver(post_save, sender=AppCategory)
+@receiver(post_delete, sender=AppCategory)
+def _invalidate_category(sender, instance, **kwargs):
+    # Deleting a category cascades to its apps, whose own signals cover that case.
+    codes = TravelApp.objects.filter(category_id=instance.pk).values_list("country__code", flat=True).distinct()
+    _schedule(list(codes), ("page", "apps"))
+
+
+for _model in COUNTRY_SCOPED_SECTIONS:
+    pre_save.connect(_remember_country_id, sender=_model, dispatch_uid=f"country_cache_pre_{_model.__name__}")
+    post_save.connect(_invalidate_country_scoped, sender=_model, dispatch_uid=f"country_cache_save_{_model.__name__}")
+    post_delete.connect(_invalidate_country_scoped, sender=_model, dispatch_uid=f"country_cache_delete_{_model.__name__}")
+
+for _model in APP_SCOPED_SECTIONS:
+    post_save.connect(_invalidate_app_scoped, sender=_model, dispatch_uid=f"country_cache_save_{_model.__name__}")
+    post_delete.connect(_invalidate_app_scoped, sender=_model, dispatch_uid=f"country_cache_delete_{_model.__name__}")
+
+
+# Cache warm-up hooks, enabled from CountryConfig.ready() by settings.
+
+def warm_caches_after_migrate(sender, **kwargs):
+    from .tasks import warm_country_caches_once
+
+    try:
+        warm_country_caches_once(only_missing=True)
+    except DatabaseError as e:
+        # E.g. migrating to an older state where the country tables don't exist.
+        logger.warning(f"Cache warm-up after migrate skipped: {e}")
+
+
+def schedule_startup_warmup():
+    """Warm missing country payloads in the background shortly after the app server starts."""
+    from .refresh_executor import PRIORITY_LOW, refresh_executor
+    from .tasks import warm_country_caches_once
+
+    # Runs after ready() returns; the cache lock keeps it to one worker process.
+    refresh_executor.submit(
+        "cache_warmup", lambda: warm_country_caches_once(only_missing=True), priority=PRIORITY_LOW, delay=5
+    )
@@ -0,0 +1,66 @@
+# country/snapshots.py
+"""Durable tier under the Redis country page cache.
+
+Signals bump a snapshot's version when the rows behind it change and queue
+a rebuild. A page cache miss reads the snapshot with one primary-key lookup
+and only walks the serializers if it is missing or out of date, writing the
+result back. Snapshots written under an older payload schema are treated
+as missing.
+"""
+import logging
+
+from django.db import DatabaseError
+from django.db.models import F
+from django.utils import timezone
+
+from services import codec
+
+from .models import CountrySnapshot
+
+logger = logging.getLogger(__name__)
+
+
+def read_country_snapshot(code):
+    """The current snapshot payload for ``code``, or None."""
+    try:
+        row = (
+            CountrySnapshot.objects.filter(code=code)
+            .values_list("payload", "version", "built_version", "schema")
+            .first()
+        )
+    except DatabaseError as e:
+        logger.warning(f"Snapshot read failed for {code}: {e}")
+        return None
+    if row is None:
+        return None
+    payload, version, built_version, schema = row
+    if built_version != version or schema != CountrySnapshot.SCHEMA or not payload:
+        return None
+    return codec.loads(bytes(payload))
+
+
+def country_snapshot_version(code):
+    """Version to pass to save_country_snapshot; read it before building."""
+    snapshot, _ = CountrySnapshot.objects.get_or_create(code=code)
+    return snapshot.version
+
+
+def save_country_snapshot(code, data, version):
+    """Store ``data`` built from rows as of ``version``; a no-op if the rows changed since."""
+    return bool(
+        CountrySnapshot.objects.filter(code=code, version=version).update(
+            data=data,
+            payload=codec.dumps(data, min_bytes=0),
+            built_version=version,
+            schema=CountrySnapshot.SCHEMA,
+            built_at=timezone.now(),
+        )
+    )
+
+
+def mark_country_snapshots_stale(codes):
+    CountrySnapshot.objects.filter(code__in=codes).update(version=F("version") + 1)
+
+
+def delete_country_snapshot(code):
+    CountrySnapshot.objects.filter(code=code).delete()
@@ -0,0 +1,215 @@
+# country/sources.py
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+
+# Hard per-source hourly call caps (defensive limits for free sources)
+SOURCE_HOURLY_CAPS = {
+    "google_news": 180,
+    "eonet": 120,
+    "gov_state": 120,
+    "gov_cdc": 120,
+    "google_play": 120,
+    "apple_app_store": 120,
+    "reddit": 120,
+}
+
+
+def _source_hour_key(source):
+    return f"source_hourly_calls:{source}:{int(time.time()) // 3600}"
+
+
+def reserve_source_call(source):
+    """Best-effort source hourly limiter. Returns True if call is allowed."""
+    cap = SOURCE_HOURLY_CAPS.get(source)
+    if not cap:
+        return True
+
+    key = _source_hour_key(source)
+    try:
+        # Seed key if missing and keep slightly beyond the hour boundary.
+        cache.add(key, 0, timeout=3900)
+        current = cache.incr(key)
+        return int(current) <= int(cap)
+    except Exception:
+        # Fail open to avoid hard outages if cache backend has issues.
+        return True
+
+
+def release_source_call(source):
+    """Hand back a reservation for a call that cost the source nothing (e.g. a 304).
+
+    Never takes the counter below zero, e.g. when the hour rolled over since
+    the reservation was made.
+    """
+    if not SOURCE_HOURLY_CAPS.get(source):
+        return
+
+    key = _source_hour_key(source)
+    try:
+        if int(cache.decr(key)) < 0:
+            cache.incr(key)
+    except Exception:
+        pass
+
+
+class SourceReservation:
+    """One hourly reservation for ``source``, possibly covering several requests.
+
+    Falsy if the cap is reached. Requests made with it (see
+    http_client.open_url) mark it ``spent`` once they reach the source; on
+    exit an unspent reservation, e.g. every request hit an open circuit, is
+    handed back exactly once.
+
+        with SourceReservation("reddit") as reservation:
+            if not reservation:
+                return []
+            fetch_json(url, source="reddit", reservation=reservation)
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.granted = reserve_source_call(source)
+        self.spent = False
+
+    def __bool__(self):
+        return self.granted
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release_if_unspent()
+        return False
+
+    def release_if_unspent(self):
+        if self.granted and not self.spent:
+            release_source_call(self.source)
+        self.granted = False
+
+
+# Circuit breaker: after BREAKER_FAILURE_THRESHOLD failures (or calls slower
+# than BREAKER_SLOW_CALL_SECONDS) within BREAKER_FAILURE_WINDOW, a source is
+# skipped instantly for a cooldown. When the cooldown ends one caller is let
+# through as a probe; a failed probe doubles the cooldown up to the maximum.
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_FAILURE_WINDOW = 120
+BREAKER_SLOW_CALL_SECONDS = 5
+BREAKER_BASE_COOLDOWN = 30
+BREAKER_MAX_COOLDOWN = 15 * 60
+BREAKER_PROBE_TIMEOUT = 30
+
+# Process-local copy of open circuits so the hot path skips a cache round trip.
+_open_until = {}
+_open_until_lock = threading.Lock()
+
+
+class SourceUnavailable(Exception):
+    """Raised instead of calling a source whose circuit is open."""
+
+
+def _breaker_key(source, part):
+    return f"source_breaker:{source}:{part}"
+
+
+def _remember_open(source, retry_at):
+    with _open_until_lock:
+        if retry_at:
+            _open_until[source] = retry_at
+        else:
+            _open_until.pop(source, None)
+
+
+def source_available(source):
+    """False while ``source``'s circuit is open; True for at most one probe once it half-opens."""
+    if not source:
+        return True
+
+    now = time.time()
+    if _open_until.get(source, 0) > now:
+        return False
+
+    try:
+        state = cache.get(_breaker_key(source, "open"))
+        if not state:
+            _remember_open(source, None)
+            return True
+
+        retry_at = float(state.get("retry_at") or 0)
+        if retry_at > now:
+            _remember_open(source, retry_at)
+            return False
+
+        # Half-open: only the caller that wins the probe slot goes through.
+        return bool(cache.add(_breaker_key(source, "probe"), 1, timeout=BREAKER_PROBE_TIMEOUT))
+    except Exception:
+        # Fail open, like the hourly limiter.
+        return True
+
+
+def _open_circuit(source, trips):
+    cooldown = min(BREAKER_MAX_COOLDOWN, BREAKER_BASE_COOLDOWN * (2 ** max(0, trips - 1)))
+    retry_at = time.time() + cooldown
+    # Keep the state around past retry_at so the next trip can back off further.
+    cache.set(_breaker_key(source, "open"), {"retry_at": retry_at, "trips": trips}, timeout=cooldown + BREAKER_MAX_COOLDOWN)
+    cache.delete_many([_breaker_key(source, "failures"), _breaker_key(source, "probe")])
+    _remember_open(source, retry_at)
+
+
+def record_source_failure(source):
+    if not source:
+        return
+
+    try:
+        state = cache.get(_breaker_key(source, "open"))
+        if state:
+            # A failed probe (or a straggler from before the trip) re-opens with a longer cooldown.
+            if float(state.get("retry_at") or 0) <= time.time():
+                _open_circuit(source, int(state.get("trips") or 1) + 1)
+            return
+
+        key = _breaker_key(source, "failures")
+        cache.add(key, 0, timeout=BREAKER_FAILURE_WINDOW)
+        if int(cache.incr(key)) >= BREAKER_FAILURE_THRESHOLD:
+            _open_circuit(source, 1)
+    except Exception:
+        pass
+
+
+def record_source_success(source, elapsed_seconds=0.0):
+    """Record a completed call; a call slower than BREAKER_SLOW_CALL_SECONDS counts as a failure."""
+    if not source:
+        return
+    if elapsed_seconds >= BREAKER_SLOW_CALL_SECONDS:
+        record_source_failure(source)
+        return
+
+    try:
+        if cache.get(_breaker_key(source, "open")) is not None:
+            cache.delete_many([_breaker_key(source, "open"), _breaker_key(source, "probe")])
+        cache.delete(_breaker_key(source, "failures"))
+    except Exception:
+        pass
+    _remember_open(source, None)
+
+
+@contextmanager
+def source_guard(source):
+    """Run a call to ``source`` through its circuit breaker.
+
+    Raises SourceUnavailable without calling out while the circuit is open;
+    any exception from the block counts as a failure.
+    """
+    if not source_available(source):
+        raise SourceUnavailable(source)
+
+    started = time.monotonic()
+    try:
+        yield
+    except Exception:
+        record_source_failure(source)
+        raise
+    record_source_success(source, time.monotonic() - started)
@@ -0,0 +1,268 @@
+# country/swr.py
+"""Stale-while-revalidate caching for expensive payload builders.
+
+    @stale_while_revalidate(lambda code: f"thing_{code}", fresh_ttl=600, storage_ttl=6 * 3600)
+    def build_thing(code):
+        ...
+
+Entries are stored as ``{"data": value, "_meta": {"fetched_at": ts, "etag": hash}}``;
+the ETag is a content hash computed once per build (see ``entry_etag``).
+With ``prerender=True`` the entry also holds ``"bodies"``: the rendered JSON
+in identity/gzip/br encodings, ready to send (see responses.py).
+A fresh entry is returned as is. A stale entry is returned immediately and
+rebuilt on the bounded refresh executor; a cache lock keeps that to one
+worker cluster-wide, and ``cooldown`` spaces out repeated refreshes. A
+missing entry is built inline by one caller while concurrent callers wait
+for its result.
+Builders returning None are not cached.
+"""
+import functools
+import hashlib
+import random
+import time
+
+from django.core.cache import cache
+
+from services import codec
+
+from .refresh_executor import PRIORITY_NORMAL, refresh_executor
+from .responses import render_bodies
+from .utils import safe_cache_get, safe_cache_get_many, safe_cache_set
+
+SWR_LOCK_TTL = 120
+# How long callers wait for another worker's inline build before building themselves.
+SWR_WAIT_SECONDS = 15
+SWR_POLL_INTERVAL = 0.1
+
+
+def _now_ts():
+    return int(time.time())
+
+
+def entry_fetched_at(entry):
+    if not isinstance(entry, dict):
+        return 0
+    return int(entry.get("_meta", {}).get("fetched_at") or 0)
+
+
+def content_etag(value):
+    return hashlib.blake2b(codec.json_dumps(value), digest_size=16).hexdigest()
+
+
+def make_entry(value, prerender=False):
+    entry = {"data": value, "_meta": {"fetched_at": _now_ts(), "etag": content_etag(value)}}
+    if prerender:
+        entry["bodies"] = render_bodies(prerender(value) if callable(prerender) else value)
+    return entry
+
+
+def entry_etag(entry):
+    """ETag stored with ``entry``; hashed on the fly for entries cached before ETags."""
+    return entry.get("_meta", {}).get("etag") or content_etag(entry["data"])
+
+
+def read_entry(key):
+    """Cached envelope for ``key``, or None if missing or in an older format."""
+    entry = safe_cache_get(key)
+    if isinstance(entry, dict) and "data" in entry:
+        return entry
+    return None
+
+
+def read_entries(keys):
+    """Batched read_entry: {key: envelope} for the keys found, in one cache round trip."""
+    found = safe_cache_get_many(keys)
+    return {key: entry for key, entry in found.items() if isinstance(entry, dict) and "data" in entry}
+
+
+def _acquire(lock_key, ttl):
+    try:
+        return bool(cache.add(lock_key, 1, timeout=ttl))
+    except Exception:
+        return True
+
+
+def _release(lock_key):
+    try:
+        cache.delete(lock_key)
+    except Exception:
+        pass
+
+
+def _lock_held(lock_key):
+    try:
+        return cache.get(lock_key) is not None
+    except Exception:
+        return False
+
+
+def _cooldown_active(cooldown_key):
+    try:
+        return cache.get(cooldown_key) is not None
+    except Exception:
+        return False
+
+
+def _set_cooldown(cooldown_key, cooldown_seconds):
+    try:
+        cache.set(cooldown_key, _now_ts(), timeout=cooldown_seconds)
+    except Exception:
+        pass
+
+
+class _SWRPolicy:
+    def __init__(
+        self, key_func, build, fresh_ttl, storage_ttl, cooldown, jitter, usable, version, priority, lock_ttl,
+        wait_seconds, prerender,
+    ):
+        self.key_func = key_func
+        self.build = build
+        self.fresh_ttl = fresh_ttl
+        self.storage_ttl = storage_ttl
+        self.cooldown = cooldown
+        self.jitter = jitter
+        self.usable = usable
+        self.version = version
+        self.priority = priority
+        self.lock_ttl = lock_ttl
+        self.wait_seconds = wait_seconds
+        self.prerender = prerender
+
+    def is_fresh(self, entry):
+        fetched_at = entry_fetched_at(entry)
+        return fetched_at > 0 and (_now_ts() - fetched_at) < self.fresh_ttl
+
+    def is_usable(self, entry):
+        return entry is not None and (self.usable is None or self.usable(entry["data"]))
+
+    def build_entry(self, key, args, kwargs):
+        token = self.version(*args, **kwargs) if self.version else None
+        value = self.build(*args, **kwargs)
+        if value is None:
+            return None
+        entry = make_entry(value, self.prerender)
+        # Skip the write if the source rows changed while we were building.
+        if self.version is None or self.version(*args, **kwargs) == token:
+            safe_cache_set(key, entry, self.storage_ttl)
+        return entry
+
+    def build_and_store(self, key, args, kwargs):
+        entry = self.build_entry(key, args, kwargs)
+        return entry["data"] if entry is not None else None
+
+    def get(self, args, kwargs):
+        entry = self.get_entry(args, kwargs)
+        return entry["data"] if entry is not None else None
+
+    def get_entry(self, args, kwargs):
+        key = self.key_func(*args, **kwargs)
+        return self.resolve_entry(key, read_entry(key), args, kwargs)
+
+    def resolve(self, key, entry, args, kwargs):
+        """Like get(), for an entry the caller already read (e.g. in a batch)."""
+        entry = self.resolve_entry(key, entry, args, kwargs)
+        return entry["data"] if entry is not None else None
+
+    def resolve_entry(self, key, entry, args, kwargs):
+        if self.is_usable(entry):
+            if not self.is_fresh(entry):
+                self.schedule_refresh(key, args, kwargs)
+            return entry
+        return self.build_single_flight(key, args, kwargs, entry)
+
+    def build_single_flight(self, key, args, kwargs, previous):
+        lock_key = f"swr_lock:{key}"
+        if _acquire(lock_key, self.lock_ttl):
+            try:
+                return self.build_entry(key, args, kwargs)
+            finally:
+                _release(lock_key)
+
+        # Someone else is building it; wait for their result.
+        seen_at = entry_fetched_at(previous)
+        deadline = time.monotonic() + self.wait_seconds
+        while time.monotonic() < deadline:
+            time.sleep(SWR_POLL_INTERVAL)
+            latest = read_entry(key)
+            if latest is not None and entry_fetched_at(latest) > seen_at:
+                return latest
+            if not _lock_held(lock_key):
+                break
+
+        latest = read_entry(key)
+        if latest is not None and entry_fetched_at(latest) > seen_at:
+            return latest
+        # The other build failed, returned nothing or is taking too long.
+        return self.build_entry(key, args, kwargs)
+
+    def schedule_refresh(self, key, args, kwargs):
+        cooldown_key = f"swr_cooldown:{key}"
+        if self.cooldown and _cooldown_active(cooldown_key):
+            return False
+        lock_key = f"swr_lock:{key}"
+        if not _acquire(lock_key, self.lock_ttl):
+            return False
+
+        def _refresh():
+            # On failure the stale payload simply keeps being served.
+            try:
+                self.build_and_store(key, args, kwargs)
+                if self.cooldown:
+                    _set_cooldown(cooldown_key, self.cooldown)
+            finally:
+                _release(lock_key)
+
+        # Jitter spreads out refreshes that went stale together.
+        delay = random.uniform(0.25, float(self.jitter)) if self.jitter else 0
+        if not refresh_executor.submit(key, _refresh, priority=self.priority, delay=delay):
+            _release(lock_key)
+            return False
+        return True
+
+
+def stale_while_revalidate(
+    key_func,
+    fresh_ttl,
+    storage_ttl,
+    cooldown=0,
+    jitter=0,
+    usable=None,
+    version=None,
+    priority=PRIORITY_NORMAL,
+    lock_ttl=SWR_LOCK_TTL,
+    wait_seconds=SWR_WAIT_SECONDS,
+    prerender=False,
+):
+    """Cache a builder's result with stale-while-revalidate semantics.
+
+    ``key_func`` receives the builder's arguments and returns the cache key.
+    ``usable(value)`` may reject a cached value, forcing an inline rebuild
+    (e.g. an empty result worth retrying). ``version(*args)`` returns a token
+    such as a generation counter; results are only stored if it did not change
+    during the build. ``priority`` orders background refreshes in the
+    executor queue (see refresh_executor.py). ``prerender`` stores the
+    response body pre-rendered and pre-compressed next to the value, for
+    endpoints that return the value as is (or a callable mapping the value to
+    the response data). The decorated function gains
+    ``.refresh(*args)``, which rebuilds and stores unconditionally,
+    ``.entry(*args)``, which returns the whole envelope (for its ETag), and
+    ``.cache_key(*args)``.
+    """
+
+    def decorator(build):
+        policy = _SWRPolicy(
+            key_func, build, fresh_ttl, storage_ttl, cooldown, jitter, usable, version, priority, lock_ttl,
+            wait_seconds, prerender,
+        )
+
+        @functools.wraps(build)
+        def wrapper(*args, **kwargs):
+            return policy.get(args, kwargs)
+
+        wrapper.refresh = lambda *args, **kwargs: policy.build_and_store(key_func(*args, **kwargs), args, kwargs)
+        wrapper.entry = lambda *args, **kwargs: policy.get_entry(args, kwargs)
+        wrapper.cache_key = key_func
+        wrapper.policy = policy
+        return wrapper
+
+    return decorator
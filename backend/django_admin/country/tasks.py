@@ -1,12 +1,41 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.cache import cache
+from django.db import connection
 from django.db.models import Q
 
 from .models import Country, TravelApp
-from .utils import safe_cache_get, safe_cache_set
-from .views import refresh_country_travel_updates, refresh_app_traveler_insight
+from .swr import make_entry
+from .utils import (
+    COUNTRY_PAYLOAD_KEYS, country_cache_generations, safe_cache_get, safe_cache_get_many, safe_cache_set,
+    safe_cache_set_many,
+)
+from .views import (
+    CACHE_TTL, refresh_country_travel_updates, refresh_app_traveler_insight, fetch_weather_for_countries,
+    _build_country_apps, _build_country_essentials, _build_country_page, _build_country_services,
+)
+
+logger = logging.getLogger(__name__)
 
 # Conservative defaults to stay within free-source limits.
 COUNTRY_BATCH_SIZE = 8
 INSIGHTS_APP_BATCH_SIZE = 20
+# Countries refreshed concurrently; each refresh fans out to its own sources.
+COUNTRY_REFRESH_WORKERS = 4
+# Warm-up builds only touch the DB and bundled CSVs, so it can run wider.
+WARMUP_WORKERS = 8
+WARMUP_LOCK_KEY = "cache_warmup_lock"
+WARMUP_LOCK_TTL = 30 * 60
+
+# Sections warm_country_caches precomputes, in the order they are warmed.
+WARMUP_BUILDERS = {
+    "page": _build_country_page,
+    "apps": _build_country_apps,
+    "essentials": _build_country_essentials,
+    "services": _build_country_services,
+}
 
 
 def refresh_travel_updates_batch():
@@ -20,15 +49,26 @@ def refresh_travel_updates_batch():
     if not isinstance(start, int):
         start = 0
 
+    batch = [countries[(start + i) % total] for i in range(min(COUNTRY_BATCH_SIZE, total))]
+
+    # One open-meteo request covers every sample point of the whole batch.
+    try:
+        weather_by_code = fetch_weather_for_countries(batch)
+    except Exception:
+        weather_by_code = {}
+
     refreshed = 0
-    for i in range(min(COUNTRY_BATCH_SIZE, total)):
-        idx = (start + i) % total
-        country = countries[idx]
-        try:
-            refresh_country_travel_updates(country)
-            refreshed += 1
-        except Exception:
-            continue
+    with ThreadPoolExecutor(max_workers=COUNTRY_REFRESH_WORKERS) as executor:
+        futures = [
+            executor.submit(refresh_country_travel_updates, country, weather_by_code.get(country.code))
+            for country in batch
+        ]
+        for future in as_completed(futures):
+            try:
+                future.result()
+                refreshed += 1
+            except Exception:
+                continue
 
     next_cursor = (start + COUNTRY_BATCH_SIZE) % total
     safe_cache_set("travel_updates_cursor", next_cursor, 7 * 24 * 60 * 60)
@@ -67,3 +107,82 @@ def refresh_traveler_insights_batch():
     safe_cache_set("traveler_insights_cursor", next_cursor, 7 * 24 * 60 * 60)
 
     return {"apps_refreshed": refreshed, "total_apps": total}
+
+
+def _build_closing_connection(build, code):
+    try:
+        return build(code)
+    finally:
+        connection.close()
+
+
+def warm_country_caches(codes=None, sections=tuple(WARMUP_BUILDERS), only_missing=False, workers=WARMUP_WORKERS):
+    """Precompute country payloads so no visitor pays for a cold cache.
+
+    Each section is built for every country in parallel (straight from the
+    DB, bypassing the SWR wrappers) and written with one pipelined SET_MANY.
+    Payloads whose country was invalidated mid-build are not written.
+    Returns per-section counts and build/write timings in seconds.
+    """
+    if codes is None:
+        codes = list(Country.objects.order_by("code").values_list("code", flat=True))
+    codes = [str(code).upper() for code in codes]
+
+    stats = {}
+    for section in sections:
+        build = WARMUP_BUILDERS[section].__wrapped__
+        prerender = WARMUP_BUILDERS[section].policy.prerender
+        key_template = COUNTRY_PAYLOAD_KEYS[section]
+        todo = codes
+        if only_missing:
+            found = safe_cache_get_many([key_template.format(code=code) for code in codes])
+            todo = [code for code in codes if key_template.format(code=code) not in found]
+
+        started = time.perf_counter()
+        generations = country_cache_generations(todo)
+        built = {}
+        failed = 0
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {executor.submit(_build_closing_connection, build, code): code for code in todo}
+            for future in as_completed(futures):
+                code = futures[future]
+                try:
+                    built[code] = future.result()
+                except Exception as e:
+                    logger.warning(f"Warm-up failed for {section} {code}: {e}")
+                    failed += 1
+        build_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        current = country_cache_generations(built)
+        entries = {
+            key_template.format(code=code): make_entry(value, prerender)
+            for code, value in built.items()
+            if value is not None and current[code] == generations[code]
+        }
+        safe_cache_set_many(entries, CACHE_TTL)
+        stats[section] = {
+            "warmed": len(entries),
+            "skipped": len(codes) - len(todo) + len(built) - len(entries),
+            "failed": failed,
+            "build_seconds": round(build_seconds, 3),
+            "write_seconds": round(time.perf_counter() - started, 3),
+        }
+    return stats
+
+
+def warm_country_caches_once(**kwargs):
+    """warm_country_caches unless another process is already warming; None if skipped."""
+    try:
+        acquired = cache.add(WARMUP_LOCK_KEY, 1, timeout=WARMUP_LOCK_TTL)
+    except Exception:
+        acquired = True
+    if not acquired:
+        return None
+    try:
+        return warm_country_caches(**kwargs)
+    finally:
+        try:
+            cache.delete(WARMUP_LOCK_KEY)
+        except Exception:
+            pass
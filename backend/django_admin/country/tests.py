@@ -1,3 +1,653 @@
-from django.test import TestCase
+import io
+import itertools
+import threading
+import time
+import types
+import uuid
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from auth_app.models import Bookmark
+from services import renderers
+
+from . import fast_serializers, http_client, sources
+from .models import (
+    AppCategory, AppScreenshot, Country, CountryServiceProvider, CountrySnapshot, CountryVisit, EmergencyContact,
+    LocalPhrase, Review, TravelApp, UsefulTip,
+)
+from .serializers import CountrySerializer, EssentialsSerializer, TravelAppSerializer
+from .refresh_executor import RefreshExecutor
+from .sources import (
+    BREAKER_BASE_COOLDOWN, BREAKER_FAILURE_THRESHOLD, SourceReservation, SourceUnavailable, record_source_failure,
+    record_source_success, release_source_call, source_available, source_guard,
+)
+from .swr import SWR_WAIT_SECONDS, make_entry, stale_while_revalidate
+from .snapshots import (
+    country_snapshot_version, mark_country_snapshots_stale, read_country_snapshot, save_country_snapshot,
+)
+from .views import _build_origin_assistance, _fetch_reddit_mentions, _serialize_country_page
+from .utils import country_cache_generation, is_marked_missing, local_cache, safe_cache_get, safe_cache_get_many, safe_cache_set
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AppQueryCountTests(TestCase):
+    """Serializing apps must cost a fixed number of queries, however many apps there are."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.country = Country.objects.create(code="TT", name="Testland")
+        cls.categories = [AppCategory.objects.create(name=f"Category {i}") for i in range(2)]
+        cls.add_apps(2)
+
+    @classmethod
+    def add_apps(cls, count):
+        start = TravelApp.objects.count()
+        for i in range(start, start + count):
+            app = TravelApp.objects.create(
+                name=f"App {i}",
+                category=cls.categories[i % len(cls.categories)],
+                country=cls.country,
+                android_link="https://example.com/app",
+            )
+            AppScreenshot.objects.create(app=app, image_url="https://example.com/screenshot.png")
+            Review.objects.create(app=app, user_id=uuid.uuid4(), rating=4)
+
+    def count_cold_queries(self, url):
+        cache.clear()
+        local_cache.clear()
+        CountrySnapshot.objects.all().delete()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assertNoNPlusOne(self, url):
+        before = self.count_cold_queries(url)
+        self.add_apps(4)
+        self.assertEqual(self.count_cold_queries(url), before, f"{url} runs more queries as apps are added")
+
+    def test_country_apps_query_count(self):
+        cache.clear()
+        local_cache.clear()
+        # country + apps (with category) + screenshots + reviews
+        with self.assertNumQueries(4):
+            response = self.client.get("/api/country/TT/apps/")
+        self.assertEqual(len(response.json()), 2)
+        self.assertEqual(len(response.json()[0]["screenshots"]), 1)
+
+    def test_unknown_country_apps_is_404(self):
+        cache.clear()
+        local_cache.clear()
+        self.assertEqual(self.client.get("/api/country/ZZ/apps/").status_code, 404)
+        self.assertIsNone(cache.get("country_apps_ZZ"))
+
+    def test_repeated_unknown_country_page_runs_no_queries(self):
+        cache.clear()
+        local_cache.clear()
+        self.assertEqual(self.client.get("/api/country/ZZ/").status_code, 404)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/api/country/ZZ/").status_code, 404)
+
+    def test_country_apps_is_not_n_plus_one(self):
+        self.assertNoNPlusOne("/api/country/TT/apps/")
+
+    def test_country_page_is_not_n_plus_one(self):
+        self.assertNoNPlusOne("/api/country/TT/")
+
+    def test_categories_is_not_n_plus_one(self):
+        self.assertNoNPlusOne("/api/country/TT/categories/")
+
+
+
+class FastSerializerParityTests(TestCase):
+    """fast_serializers must render byte-for-byte what the DRF serializers render."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.country = Country.objects.create(code="TT", name="Testland", flag="flags/tt.png", description="Flat")
+        Country.objects.create(code="UU", name="Otherland")
+        categories = [AppCategory.objects.create(name=f"Category {i}") for i in range(3)]
+        for i in range(5):
+            app = TravelApp.objects.create(
+                name=f"App {i}",
+                description="" if i % 2 else None,
+                category=categories[i % 2],
+                country=cls.country,
+                android_link=f"https://example.com/{i}" if i % 2 else None,
+                affiliate_url="https://example.com/aff" if i == 3 else None,
+                is_sponsored=i == 4,
+            )
+            for _ in range(i % 3):
+                AppScreenshot.objects.create(app=app, image_url="https://example.com/screenshot.png")
+                Review.objects.create(app=app, user_id=uuid.uuid4(), rating=3.5)
+        EmergencyContact.objects.create(country=cls.country, name="Police", phone="191")
+        LocalPhrase.objects.create(country=cls.country, original="Hello", translation="Sawasdee")
+        UsefulTip.objects.create(country=cls.country, tip="Carry cash")
+
+    def assertSameJSON(self, drf_data, fast_data):
+        self.assertEqual(JSONRenderer().render(fast_data), JSONRenderer().render(drf_data))
+
+    def test_travel_apps(self):
+        qs = TravelApp.objects.filter(country=self.country).order_by("-is_sponsored", "name")
+        self.assertSameJSON(
+            TravelAppSerializer(TravelAppSerializer.prefetch(qs), many=True).data,
+            fast_serializers.serialize_travel_apps(qs),
+        )
+
+    def test_country_page(self):
+        self.assertSameJSON(_serialize_country_page(self.country), fast_serializers.serialize_country_page(self.country))
+
+    def test_countries(self):
+        countries = Country.objects.order_by("code")
+        self.assertSameJSON(CountrySerializer(countries, many=True).data, fast_serializers.serialize_countries(countries))
+
+    def test_essentials(self):
+        self.assertSameJSON(EssentialsSerializer(self.country).data, fast_serializers.serialize_essentials(self.country))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class OriginAssistanceNegativeCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Not in ORIGIN_ASSISTANCE_SEED, so both web fallbacks are tried.
+        Country.objects.create(code="TT", name="Testland")
+
+    def setUp(self):
+        cache.clear()
+
+    def build(self, wikidata, nominatim):
+        with mock.patch("country.views._fetch_origin_assistance_from_wikidata", **wikidata), \
+                mock.patch("country.views._fetch_origin_assistance_from_nominatim", **nominatim):
+            return _build_origin_assistance.__wrapped__("TT")
+
+    def test_empty_result_is_remembered(self):
+        self.assertIsNone(self.build({"return_value": None}, {"return_value": None}))
+        self.assertTrue(is_marked_missing("origin_assistance", "TT"))
+
+    def test_upstream_failure_is_not_remembered(self):
+        self.assertIsNone(self.build({"side_effect": SourceUnavailable("wikidata")}, {"return_value": None}))
+        self.assertFalse(is_marked_missing("origin_assistance", "TT"))
+
+
+@skipUnless(renderers.orjson is not None, "orjson is not installed")
+class ORJSONRendererTests(TestCase):
+    def render(self, data):
+        return renderers.ORJSONRenderer().render(data), JSONRenderer().render(data)
+
+    def test_matches_drf(self):
+        fast, drf = self.render({"name": "Testland \u2028", 1: [1.5, None, True], "rating": 4})
+        self.assertEqual(fast, drf)
+
+    def test_big_integers_fall_back_to_drf(self):
+        fast, drf = self.render({"id": 2 ** 70})
+        self.assertEqual(fast, drf)
+
+    def test_known_float_differences(self):
+        # Documented in services/renderers.py: exponent formatting and NaN.
+        fast, drf = self.render([1e16, 1e-7])
+        self.assertEqual(fast, b"[1e16,1e-7]")
+        self.assertEqual(drf, b"[1e+16,1e-07]")
+        self.assertEqual(renderers.ORJSONRenderer().render([float("nan")]), b"[null]")
+        with self.assertRaises(ValueError):
+            JSONRenderer().render([float("nan")])
+
+
+class _FakeRaw:
+    def __init__(self, body):
+        self._body = io.BytesIO(body)
+
+    def read(self, size=-1, decode_content=True):
+        return self._body.read(size)
+
+
+class _FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.raw = _FakeRaw(body)
+
+    def raise_for_status(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ConditionalGetTests(TestCase):
+    url = "https://example.com/feed.xml"
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, response, read, reservation=None):
+        session = mock.Mock()
+        session.get.return_value = response
+        with mock.patch.object(http_client, "get_session", return_value=session):
+            with http_client.open_url(self.url, reservation=reservation) as stream:
+                return read(stream), session.get.call_args.kwargs["headers"]
+
+    def test_full_body_is_replayed_on_304(self):
+        body = b"<rss>" + b"<item/>" * 1000 + b"</rss>"
+        first, _ = self.get(_FakeResponse(200, body, {"ETag": '"v1"'}), lambda stream: stream.read())
+        self.assertEqual(first, body)
+
+        replayed, headers = self.get(_FakeResponse(304), lambda stream: stream.read())
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(replayed, body)
+
+    def test_partial_read_is_not_recorded_or_drained(self):
+        response = _FakeResponse(200, b"<rss>" + b"<item/>" * 1000 + b"</rss>", {"ETag": '"v1"'})
+        self.get(response, lambda stream: stream.read(16))
+        self.assertEqual(response.raw._body.tell(), 16)
+
+        _, headers = self.get(_FakeResponse(200, b"{}"), lambda stream: stream.read())
+        self.assertNotIn("If-None-Match", headers)
+
+    def test_reservation_is_handed_back_once_when_every_request_is_a_304(self):
+        self.get(_FakeResponse(200, b"{}", {"ETag": '"v1"'}), lambda stream: stream.read())
+        hour_key = sources._source_hour_key("reddit")
+
+        with SourceReservation("reddit") as reservation:
+            for _ in range(3):
+                self.get(_FakeResponse(304), lambda stream: stream.read(), reservation)
+        self.assertEqual(cache.get(hour_key), 0)
+
+        with SourceReservation("reddit") as reservation:
+            self.get(_FakeResponse(304), lambda stream: stream.read(), reservation)
+            self.get(_FakeResponse(200, b"{}", {"ETag": '"v2"'}), lambda stream: stream.read(), reservation)
+        self.assertEqual(cache.get(hour_key), 1)
+
+
+@skipUnless(connection.vendor in ("postgresql", "sqlite"), "EXPLAIN checks are written for PostgreSQL and SQLite")
+class HotQueryIndexTests(TestCase):
+    """The hot list queries must be answered from their composite indexes, without a separate sort."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.country = Country.objects.create(code="TT", name="Testland")
+        cls.user = get_user_model().objects.create_user(username="traveler", password="pw")
+
+    def explain(self, queryset):
+        if connection.vendor == "postgresql":
+            # Test tables are tiny; make the planner show whether the index *can* serve the query.
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset, index_name, ordered_by_index=True):
+        plan = self.explain(queryset)
+        self.assertIn(index_name, plan, plan)
+        if ordered_by_index:
+            sort_step = "USE TEMP B-TREE FOR ORDER BY" if connection.vendor == "sqlite" else "Sort"
+            self.assertNotIn(sort_step, plan, plan)
+
+    def test_country_apps(self):
+        self.assertUsesIndex(
+            TravelApp.objects.filter(country__code="TT").order_by("-is_sponsored", "name"),
+            "travelapp_country_listing_idx",
+        )
+
+    def test_country_services(self):
+        self.assertUsesIndex(
+            CountryServiceProvider.objects.filter(country=self.country).order_by("section", "-is_featured", "name"),
+            "service_country_section_idx",
+        )
+
+    def test_popular_countries(self):
+        # Ties on visit_count are broken by country name, which needs the join; the
+        # index still drives the scan (PostgreSQL finishes with an incremental sort).
+        self.assertUsesIndex(
+            CountryVisit.objects.select_related("country")
+            .filter(visit_count__gt=0)
+            .order_by("-visit_count", "country__name")[:6],
+            "countryvisit_popular_idx",
+            ordered_by_index=False,
+        )
+
+    def test_bookmarks(self):
+        self.assertUsesIndex(
+            Bookmark.objects.filter(user=self.user).order_by("-created_at"),
+            "bookmark_user_recent_idx",
+        )
+
+
+class CountrySnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Country.objects.create(code="TT", name="Testland")
+
+    def test_snapshot_from_older_schema_is_ignored(self):
+        version = country_snapshot_version("TT")
+        self.assertTrue(save_country_snapshot("TT", {"name": "Testland"}, version))
+        self.assertEqual(read_country_snapshot("TT"), {"name": "Testland"})
+
+        CountrySnapshot.objects.filter(code="TT").update(schema=CountrySnapshot.SCHEMA - 1)
+        self.assertIsNone(read_country_snapshot("TT"))
+
+    def test_stale_snapshot_is_ignored(self):
+        save_country_snapshot("TT", {"name": "Testland"}, country_snapshot_version("TT"))
+        mark_country_snapshots_stale(["TT"])
+        self.assertIsNone(read_country_snapshot("TT"))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class StaleWhileRevalidateTests(TestCase):
+    key = "swr_test"
+    lock_key = "swr_lock:swr_test"
+
+    def setUp(self):
+        cache.clear()
+
+    def cached(self, build, **options):
+        return stale_while_revalidate(lambda: self.key, fresh_ttl=60, storage_ttl=600, **options)(build)
+
+    def test_miss_is_built_and_stored(self):
+        build = mock.Mock(return_value="value")
+        self.assertEqual(self.cached(build)(), "value")
+        self.assertEqual(cache.get(self.key)["data"], "value")
+        self.assertIsNone(cache.get(self.lock_key))
+
+    def test_waiter_gets_the_result_of_the_build_in_progress(self):
+        build = mock.Mock(return_value="mine")
+        cached = self.cached(build)
+        cache.add(self.lock_key, 1)
+        # The other worker stores its result while we poll.
+        with mock.patch("country.swr.time.sleep", side_effect=lambda _: cache.set(self.key, make_entry("theirs"))):
+            self.assertEqual(cached(), "theirs")
+        build.assert_not_called()
+
+    def test_waiter_builds_when_the_other_build_stored_nothing(self):
+        build = mock.Mock(return_value="mine")
+        cached = self.cached(build)
+        cache.add(self.lock_key, 1)
+        with mock.patch("country.swr.time.sleep", side_effect=lambda _: cache.delete(self.lock_key)):
+            self.assertEqual(cached(), "mine")
+        build.assert_called_once()
+
+    def test_waiter_gives_up_after_wait_seconds(self):
+        build = mock.Mock(return_value="mine")
+        cached = self.cached(build)
+        self.assertEqual(cached.policy.wait_seconds, SWR_WAIT_SECONDS)
+        cache.add(self.lock_key, 1)
+        clock = itertools.count(0, SWR_WAIT_SECONDS / 3)
+        with mock.patch("country.swr.time.sleep") as sleep, \
+                mock.patch("country.swr.time.monotonic", side_effect=lambda: next(clock)):
+            self.assertEqual(cached(), "mine")
+        self.assertEqual(sleep.call_count, 2)
+        build.assert_called_once()
+
+    def test_result_is_not_stored_if_the_version_changed_during_the_build(self):
+        version = mock.Mock(side_effect=[1, 2])
+        self.assertEqual(self.cached(mock.Mock(return_value="value"), version=version)(), "value")
+        self.assertIsNone(cache.get(self.key))
+
+    def test_stale_entry_is_served_and_refreshed_in_the_background(self):
+        stale = make_entry("stale")
+        stale["_meta"]["fetched_at"] -= 120
+        cache.set(self.key, stale)
+        build = mock.Mock(return_value="fresh")
+        cached = self.cached(build)
+
+        with mock.patch("country.swr.refresh_executor.submit", return_value=True) as submit:
+            self.assertEqual(cached(), "stale")
+            # A second stale read while the refresh is pending doesn't queue another.
+            self.assertEqual(cached(), "stale")
+        build.assert_not_called()
+        submit.assert_called_once()
+        self.assertEqual(submit.call_args.args[0], self.key)
+
+        submit.call_args.args[1]()
+        self.assertEqual(cache.get(self.key)["data"], "fresh")
+        self.assertIsNone(cache.get(self.lock_key))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CircuitBreakerTests(TestCase):
+    source = "test_source"
+
+    def setUp(self):
+        cache.clear()
+        sources._open_until.clear()
+        self.addCleanup(sources._open_until.clear)
+
+    def trip(self):
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            record_source_failure(self.source)
+
+    def open_state(self):
+        return cache.get(f"source_breaker:{self.source}:open")
+
+    def end_cooldown(self):
+        state = self.open_state()
+        state["retry_at"] = time.time() - 1
+        cache.set(f"source_breaker:{self.source}:open", state)
+        sources._open_until.clear()
+
+    def test_opens_after_threshold_failures(self):
+        for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+            record_source_failure(self.source)
+        self.assertTrue(source_available(self.source))
+
+        record_source_failure(self.source)
+        self.assertFalse(source_available(self.source))
+        with self.assertRaises(SourceUnavailable):
+            with source_guard(self.source):
+                self.fail("an open circuit must not call the source")
+
+    def test_success_resets_the_failure_count(self):
+        for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+            record_source_failure(self.source)
+        record_source_success(self.source)
+        record_source_failure(self.source)
+        self.assertTrue(source_available(self.source))
+
+    def test_half_open_lets_one_probe_through_and_closes_on_success(self):
+        self.trip()
+        self.end_cooldown()
+        self.assertTrue(source_available(self.source))
+        self.assertFalse(source_available(self.source), "only one probe at a time")
+
+        record_source_success(self.source)
+        self.assertIsNone(self.open_state())
+        self.assertTrue(source_available(self.source))
+        self.assertTrue(source_available(self.source))
+
+    def test_failed_probe_doubles_the_cooldown(self):
+        self.trip()
+        self.assertEqual(self.open_state()["trips"], 1)
+        self.end_cooldown()
+        self.assertTrue(source_available(self.source))
+
+        record_source_failure(self.source)
+        state = self.open_state()
+        self.assertEqual(state["trips"], 2)
+        self.assertAlmostEqual(state["retry_at"] - time.time(), 2 * BREAKER_BASE_COOLDOWN, delta=5)
+        self.assertFalse(source_available(self.source))
+
+    def test_slow_call_counts_as_failure(self):
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            record_source_success(self.source, elapsed_seconds=sources.BREAKER_SLOW_CALL_SECONDS)
+        self.assertFalse(source_available(self.source))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SourceReservationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        sources._open_until.clear()
+        self.addCleanup(sources._open_until.clear)
+
+    def calls_this_hour(self, source):
+        return cache.get(sources._source_hour_key(source))
+
+    def test_release_never_goes_below_zero(self):
+        SourceReservation("reddit").release_if_unspent()
+        release_source_call("reddit")
+        self.assertEqual(self.calls_this_hour("reddit"), 0)
+
+    def test_open_circuit_returns_a_shared_reservation_once(self):
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            record_source_failure("reddit")
+        app = types.SimpleNamespace(name="Maps")
+        # Each lookup reserves once for up to three searches, all refused by the breaker.
+        for _ in range(3):
+            self.assertEqual(_fetch_reddit_mentions(app, "Testland"), [])
+        self.assertEqual(self.calls_this_hour("reddit"), 0)
+
+    def test_spent_reservation_is_kept(self):
+        with SourceReservation("reddit") as reservation:
+            reservation.spent = True
+        self.assertEqual(self.calls_this_hour("reddit"), 1)
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class LocalCacheTests(TestCase):
+    key = "country_page_TT"
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+
+    def write_from_another_process(self, value):
+        cache.set_many({self.key: value, f"cache_stamp:{self.key}": uuid.uuid4().hex})
+
+    def test_copy_is_served_locally_within_the_revalidate_window(self):
+        safe_cache_set(self.key, "v1", 60)
+        self.write_from_another_process("v2")
+        self.assertEqual(safe_cache_get(self.key), "v1")
+
+    @mock.patch("country.utils.L1_REVALIDATE_SECONDS", 0)
+    def test_copy_with_current_stamp_is_reused(self):
+        safe_cache_set(self.key, "v1", 60)
+        # Same stamp: Redis is not asked for the value itself.
+        cache.set(self.key, "unreachable")
+        self.assertEqual(safe_cache_get(self.key), "v1")
+        self.assertEqual(safe_cache_get_many([self.key]), {self.key: "v1"})
+
+    @mock.patch("country.utils.L1_REVALIDATE_SECONDS", 0)
+    def test_copy_with_changed_stamp_is_replaced(self):
+        safe_cache_set(self.key, "v1", 60)
+        self.write_from_another_process("v2")
+        self.assertEqual(safe_cache_get(self.key), "v2")
+
+        self.write_from_another_process("v3")
+        self.assertEqual(safe_cache_get_many([self.key]), {self.key: "v3"})
+
+    @mock.patch("country.utils.L1_REVALIDATE_SECONDS", 0)
+    def test_deleted_stamp_evicts_the_copy(self):
+        safe_cache_set(self.key, "v1", 60)
+        cache.delete_many([self.key, f"cache_stamp:{self.key}"])
+        self.assertIsNone(safe_cache_get(self.key))
+        self.assertIsNone(local_cache.get(self.key))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CacheInvalidationSignalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.country = Country.objects.create(code="TT", name="Testland")
+        cls.other = Country.objects.create(code="UU", name="Otherland")
+        cls.category = AppCategory.objects.create(name="Maps")
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        submit = mock.patch("country.refresh_executor.refresh_executor.submit", return_value=True)
+        self.submit = submit.start()
+        self.addCleanup(submit.stop)
+
+    def cache_sections(self, code, sections):
+        for section in sections:
+            safe_cache_set(f"country_{section}_{code}", {"cached": True}, 60)
+
+    def test_app_change_evicts_page_and_apps_after_commit(self):
+        self.cache_sections("TT", ("page", "apps", "essentials"))
+        save_country_snapshot("TT", {"name": "Testland"}, country_snapshot_version("TT"))
+        generation = country_cache_generation("TT")
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            TravelApp.objects.create(name="App", category=self.category, country=self.country)
+            # Nothing is evicted before the transaction commits.
+            self.assertIsNotNone(safe_cache_get("country_apps_TT"))
+        for callback in callbacks:
+            callback()
+
+        self.assertIsNone(safe_cache_get("country_page_TT"))
+        self.assertIsNone(safe_cache_get("country_apps_TT"))
+        self.assertIsNotNone(safe_cache_get("country_essentials_TT"))
+        self.assertGreater(country_cache_generation("TT"), generation)
+        self.assertIsNone(read_country_snapshot("TT"))
+        self.assertEqual(self.submit.call_args.args[0], "country_snapshot:TT")
+
+    def test_snapshot_goes_stale_before_the_cache_is_dropped(self):
+        save_country_snapshot("TT", {"name": "Testland"}, country_snapshot_version("TT"))
+        seen = []
+        with mock.patch(
+            "country.signals.invalidate_country_caches",
+            side_effect=lambda code, sections: seen.append(read_country_snapshot(code)),
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                TravelApp.objects.create(name="App", category=self.category, country=self.country)
+        self.assertEqual(seen, [None])
+
+    def test_moving_a_row_evicts_both_countries(self):
+        contact = EmergencyContact.objects.create(country=self.country, name="Police", phone="112")
+        self.cache_sections("TT", ("essentials",))
+        self.cache_sections("UU", ("essentials",))
+
+        contact.country = self.other
+        with self.captureOnCommitCallbacks(execute=True):
+            contact.save()
+
+        self.assertIsNone(safe_cache_get("country_essentials_TT"))
+        self.assertIsNone(safe_cache_get("country_essentials_UU"))
+        self.submit.assert_not_called()
+
+
+class RefreshExecutorTests(TestCase):
+    def executor(self, **options):
+        executor = RefreshExecutor(workers=1, **options)
+        self.addCleanup(executor.shutdown, timeout=1)
+        return executor
+
+    def test_pending_key_is_not_queued_twice(self):
+        executor = self.executor()
+        self.assertTrue(executor.submit("a", lambda: None, delay=60))
+        self.assertFalse(executor.submit("a", lambda: None))
+        self.assertEqual(executor.metrics()["deduplicated"], 1)
+
+    def test_key_can_be_queued_again_once_done(self):
+        executor = self.executor()
+        done = threading.Event()
+        self.assertTrue(executor.submit("a", done.set))
+        self.assertTrue(done.wait(5))
+        deadline = time.monotonic() + 5
+        while executor.metrics()["completed"] < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(executor.submit("a", lambda: None))
+
+    def test_full_queue_rejects_new_keys(self):
+        executor = self.executor(max_queued=2)
+        self.assertTrue(executor.submit("a", lambda: None, delay=60))
+        self.assertTrue(executor.submit("b", lambda: None, delay=60))
+        self.assertFalse(executor.submit("c", lambda: None))
+        self.assertEqual(executor.metrics()["rejected"], 1)
+
+    def test_shutdown_runs_scheduled_work_and_stops_accepting(self):
+        executor = self.executor()
+        ran = []
+        executor.submit("a", lambda: ran.append("a"), delay=60)
+        executor.shutdown(timeout=5)
+        self.assertEqual(ran, ["a"])
+        self.assertFalse(executor.submit("b", lambda: None))
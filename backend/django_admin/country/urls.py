@@ -7,6 +7,7 @@ from .views import (
     TravelAppListView,
     country_essentials_view,
     country_services_view,
+    country_bundle_view,
     country_travel_updates_view,
     app_traveler_insights_view,
 )
@@ -20,6 +21,7 @@ urlpatterns = [
     
     path("<str:country_code>/essentials/", country_essentials_view, name="country_essentials"),
     path("<str:country_code>/services/", country_services_view, name="country_services"),
+    path("<str:country_code>/bundle/", country_bundle_view, name="country_bundle"),
     path("<str:country_code>/travel-updates/", country_travel_updates_view, name="country_travel_updates"),
     path("<str:country_code>/apps/<int:app_id>/insights/", app_traveler_insights_view, name="app_traveler_insights"),
 ]
@@ -1,10 +1,180 @@
 # country/utils.py
 import logging
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
 from django.core.cache import cache
 
 logger = logging.getLogger(__name__)
 
+# Payloads that only change when admins edit data are also kept in a small
+# per-process LRU (L1) in front of Redis (L2). Every write bumps a version
+# stamp in Redis; an L1 copy is served without a network round trip for
+# L1_REVALIDATE_SECONDS, then its stamp is compared with Redis before reuse.
+L1_CACHE_PREFIXES = ("country_page_", "country_apps_", "country_essentials_", "country_services_")
+L1_MAX_BYTES = 32 * 1024 * 1024
+L1_TTL_SECONDS = 10 * 60
+L1_REVALIDATE_SECONDS = 5
+
+
+def _stamp_key(key):
+    return f"cache_stamp:{key}"
+
+
+class LocalLRUCache:
+    """Thread-safe LRU of pickled values bounded by total size in bytes."""
+
+    def __init__(self, max_bytes, ttl_seconds):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (blob, stamp, expires_at, checked_at)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (blob, stamp, checked_at) for a live entry, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            blob, stamp, expires_at, checked_at = entry
+            if expires_at <= time.monotonic():
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return blob, stamp, checked_at
+
+    def set(self, key, blob, stamp):
+        if len(blob) > self.max_bytes // 4:
+            # One oversized payload shouldn't flush everything else.
+            self.delete(key)
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (blob, stamp, now + self.ttl_seconds, now)
+            self._size += len(blob)
+            while self._size > self.max_bytes and self._entries:
+                self._discard(next(iter(self._entries)))
+
+    def touch(self, key):
+        """Mark an entry's stamp as just revalidated."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = entry[:3] + (time.monotonic(),)
+
+    def delete(self, key):
+        with self._lock:
+            self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[0])
+
+
+local_cache = LocalLRUCache(L1_MAX_BYTES, L1_TTL_SECONDS)
+
+
+def _uses_l1(key):
+    return key.startswith(L1_CACHE_PREFIXES)
+
+
+def _l1_get(key):
+    hit = local_cache.get(key)
+    if hit is not None:
+        blob, stamp, checked_at = hit
+        if time.monotonic() - checked_at < L1_REVALIDATE_SECONDS:
+            return pickle.loads(blob)
+        try:
+            current = cache.get(_stamp_key(key))
+        except Exception as e:
+            logger.warning(f"Redis GET failed for {_stamp_key(key)}: {e}")
+            # Redis is unreachable; the local copy is the best we have.
+            return pickle.loads(blob)
+        if current == stamp:
+            local_cache.touch(key)
+            return pickle.loads(blob)
+        local_cache.delete(key)
+
+    try:
+        found = cache.get_many([key, _stamp_key(key)])
+    except Exception as e:
+        logger.warning(f"Redis GET failed for {key}: {e}")
+        return None
+    val = found.get(key)
+    stamp = found.get(_stamp_key(key))
+    # Values without a stamp can't be invalidated remotely, so they stay L2-only.
+    if val is not None and stamp is not None:
+        local_cache.set(key, pickle.dumps(val, pickle.HIGHEST_PROTOCOL), stamp)
+    return val
+
+
+def _l1_set(key, val, ttl):
+    stamp = uuid.uuid4().hex
+    try:
+        cache.set_many({key: val, _stamp_key(key): stamp}, ttl)
+    except Exception as e:
+        logger.warning(f"Redis SET failed for {key}: {e}")
+        local_cache.delete(key)
+        return
+    local_cache.set(key, pickle.dumps(val, pickle.HIGHEST_PROTOCOL), stamp)
+
+
+def safe_cache_get_many(keys):
+    """Batched safe_cache_get: L1 hits are served locally, everything else in one get_many."""
+    found = {}
+    remote = []
+    revalidate = {}  # key -> (blob, stamp) of L1 copies due for a stamp check
+    for key in keys:
+        if _uses_l1(key):
+            hit = local_cache.get(key)
+            if hit is not None:
+                blob, stamp, checked_at = hit
+                if time.monotonic() - checked_at < L1_REVALIDATE_SECONDS:
+                    found[key] = pickle.loads(blob)
+                    continue
+                revalidate[key] = (blob, stamp)
+        remote.append(key)
+    if not remote:
+        return found
+
+    fetch = remote + [_stamp_key(key) for key in remote if _uses_l1(key)]
+    try:
+        result = cache.get_many(fetch)
+    except Exception as e:
+        logger.warning(f"Redis GET_MANY failed for {', '.join(remote)}: {e}")
+        for key, (blob, _) in revalidate.items():
+            found[key] = pickle.loads(blob)
+        return found
+
+    for key in remote:
+        stamp = result.get(_stamp_key(key))
+        if key in revalidate and revalidate[key][1] == stamp:
+            local_cache.touch(key)
+            found[key] = pickle.loads(revalidate[key][0])
+            continue
+        local_cache.delete(key)
+        val = result.get(key)
+        if val is None:
+            continue
+        found[key] = val
+        if _uses_l1(key) and stamp is not None:
+            local_cache.set(key, pickle.dumps(val, pickle.HIGHEST_PROTOCOL), stamp)
+    return found
+
 def safe_cache_get(key):
+    if _uses_l1(key):
+        return _l1_get(key)
     try:
         return cache.get(key)
     except Exception as e:
@@ -12,7 +182,95 @@ def safe_cache_get(key):
         return None
 
 def safe_cache_set(key, val, ttl):
+    if _uses_l1(key):
+        _l1_set(key, val, ttl)
+        return
     try:
         cache.set(key, val, ttl)
     except Exception as e:
         logger.warning(f"Redis SET failed for {key}: {e}")
+
+def safe_cache_set_many(mapping, ttl):
+    """Pipelined safe_cache_set for many keys; L1 stamps are written in the same batch."""
+    if not mapping:
+        return
+    stamps = {key: uuid.uuid4().hex for key in mapping if _uses_l1(key)}
+    try:
+        cache.set_many({**mapping, **{_stamp_key(key): stamp for key, stamp in stamps.items()}}, ttl)
+    except Exception as e:
+        logger.warning(f"Redis SET_MANY failed for {len(mapping)} keys: {e}")
+        for key in stamps:
+            local_cache.delete(key)
+        return
+    for key, stamp in stamps.items():
+        local_cache.set(key, pickle.dumps(mapping[key], pickle.HIGHEST_PROTOCOL), stamp)
+
+def safe_cache_delete(*keys):
+    """Delete keys everywhere; other workers drop their L1 copies at their next stamp check."""
+    for key in keys:
+        local_cache.delete(key)
+    try:
+        cache.delete_many(list(keys))
+        # A fresh stamp (rather than none) is what tells other workers to drop their copy.
+        stamps = {_stamp_key(key): uuid.uuid4().hex for key in keys if _uses_l1(key)}
+        if stamps:
+            cache.set_many(stamps, L1_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Redis DELETE failed for {', '.join(keys)}: {e}")
+
+
+# Country payload keys, grouped so model changes can invalidate just what they affect.
+COUNTRY_PAYLOAD_KEYS = {
+    "page": "country_page_{code}",
+    "apps": "country_apps_{code}",
+    "essentials": "country_essentials_{code}",
+    "services": "country_services_{code}",
+    "origin_assistance": "origin_assistance_{code}",
+}
+
+# Lookups known to come back empty, remembered briefly so repeats cost no DB
+# or upstream work. Cleared together with the positive keys above.
+NEGATIVE_CACHE_KEYS = {
+    "country": "country_missing_{code}",
+    "origin_assistance": "origin_assistance_missing_{code}",
+}
+
+
+def is_marked_missing(kind, code):
+    return safe_cache_get(NEGATIVE_CACHE_KEYS[kind].format(code=str(code).upper())) is not None
+
+
+def mark_missing(kind, code, ttl):
+    safe_cache_set(NEGATIVE_CACHE_KEYS[kind].format(code=str(code).upper()), 1, ttl)
+
+
+def _country_generation_key(code):
+    return f"country_generation_{str(code).upper()}"
+
+
+def country_cache_generation(code):
+    """Counter bumped on every invalidation of a country's payloads."""
+    return safe_cache_get(_country_generation_key(code)) or 0
+
+
+def country_cache_generations(codes):
+    """country_cache_generation for many codes in one round trip."""
+    keys = {code: _country_generation_key(code) for code in codes}
+    found = safe_cache_get_many(list(keys.values()))
+    return {code: found.get(key) or 0 for code, key in keys.items()}
+
+
+def invalidate_country_caches(code, sections=tuple(COUNTRY_PAYLOAD_KEYS)):
+    code = str(code or "").strip().upper()
+    if not code:
+        return
+    key = _country_generation_key(code)
+    try:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+    except Exception as e:
+        logger.warning(f"Redis INCR failed for {key}: {e}")
+    keys = [COUNTRY_PAYLOAD_KEYS[section].format(code=code) for section in sections]
+    keys += [template.format(code=code) for template in NEGATIVE_CACHE_KEYS.values()]
+    safe_cache_delete(*keys)
+
@@ -1,3 +1,4 @@
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
@@ -7,23 +8,32 @@ from .serializers import AppCategorySerializer, TravelAppSerializer, CountrySeri
 from django.views.decorators.cache import cache_page
 from django.views.decorators.vary import vary_on_headers
 from django.utils.decorators import method_decorator
-from django.core.cache import cache
-from .utils import safe_cache_get, safe_cache_set
+from .utils import country_cache_generation, is_marked_missing, mark_missing
+from .swr import content_etag, entry_etag, read_entries, stale_while_revalidate
+from .responses import combine_etags, conditional_response
+from . import fast_serializers
+from .snapshots import country_snapshot_version, delete_country_snapshot, read_country_snapshot, save_country_snapshot
+from .refresh_executor import PRIORITY_HIGH, PRIORITY_LOW
+from .sources import SourceReservation, reserve_source_call, release_source_call, source_guard, SourceUnavailable
+from .http_client import open_url, fetch_json
+from .feeds import GOV_ADVISORY_FEEDS, get_feed_snapshot, get_eonet_snapshot, candidate_items, iter_rss_items
+from .geo import country_bounds, country_centroid
+from .matching import get_country_matcher
 from django.db.models import Prefetch
 from django.db.models import F
-from django.db import transaction
+from django.db import connection, transaction
 from urllib.parse import quote, urlparse, parse_qs, urlencode
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 import csv
 import re
-import json
 import time
-import random
-import threading
 
 
-CACHE_TTL = 60 * 60  # 1h
+# Country page / apps / essentials payloads are evicted by signals when their
+# rows change (see signals.py), so they can live for days.
+CACHE_TTL = 2 * 24 * 60 * 60  # 2d
 
 POPULAR_COUNTRIES_LIMIT = 6
 POPULAR_COUNTRY_FALLBACK_CODES = ["TH", "FR", "US", "JP", "AU", "IT"]
@@ -37,102 +47,70 @@ TRAVELER_INSIGHTS_FRESH_TTL = 12 * 60 * 60 # 12h fresh window
 TRAVEL_UPDATES_STORAGE_TTL = 6 * 60 * 60   # 6h
 TRAVELER_INSIGHTS_STORAGE_TTL = 24 * 60 * 60  # 24h
 
-# Cooldowns and locks to avoid duplicate/storm refreshes
+ORIGIN_ASSISTANCE_FRESH_TTL = 60 * 60           # 1h
+ORIGIN_ASSISTANCE_STORAGE_TTL = 7 * 24 * 60 * 60  # 7d
+POPULAR_COUNTRIES_FRESH_TTL = 5 * 60       # 5 min
+POPULAR_COUNTRIES_STORAGE_TTL = 60 * 60    # 1h
+
+# Cooldowns to avoid back-to-back background refreshes
 TRAVEL_UPDATES_REFRESH_COOLDOWN = 5 * 60   # 5 min
 TRAVELER_INSIGHTS_REFRESH_COOLDOWN = 30 * 60  # 30 min
-REFRESH_LOCK_TTL = 120
-
-# Hard per-source hourly call caps (defensive limits for free sources)
-SOURCE_HOURLY_CAPS = {
-    "google_news": 180,
-    "eonet": 120,
-    "gov_state": 120,
-    "gov_cdc": 120,
-    "google_play": 120,
-    "apple_app_store": 120,
-    "reddit": 120,
-}
 
+# Overall wall-clock budget for one travel-updates refresh. All sources are
+# queried concurrently and whatever has arrived by the deadline is merged.
+TRAVEL_UPDATES_FETCH_DEADLINE = 12  # seconds
+
+# Negative cache windows: unknown country codes (bots probing URLs) and
+# origins with no assistance data anywhere.
+COUNTRY_MISSING_TTL = 5 * 60
+ORIGIN_ASSISTANCE_MISSING_TTL = 60 * 60
 
 def _now_ts():
     return int(time.time())
 
 
-def _payload_fetched_at(payload):
-    if not isinstance(payload, dict):
-        return 0
-    return int(payload.get("_meta", {}).get("fetched_at") or 0)
-
-
-def _is_fresh(payload, ttl_seconds):
-    fetched_at = _payload_fetched_at(payload)
-    if fetched_at <= 0:
-        return False
-    return (_now_ts() - fetched_at) < ttl_seconds
-
-
-def _source_hour_key(source):
-    return f"source_hourly_calls:{source}:{_now_ts() // 3600}"
-
-
-def _reserve_source_call(source):
-    """Best-effort source hourly limiter. Returns True if call is allowed."""
-    cap = SOURCE_HOURLY_CAPS.get(source)
-    if not cap:
-        return True
-
-    key = _source_hour_key(source)
-    try:
-        # Seed key if missing and keep slightly beyond the hour boundary.
-        cache.add(key, 0, timeout=3900)
-        current = cache.incr(key)
-        return int(current) <= int(cap)
-    except Exception:
-        # Fail open to avoid hard outages if cache backend has issues.
-        return True
-
-
-def _with_refresh_lock(lock_key):
+def _run_closing_connection(fn):
+    # Lazy lookups (e.g. the geography table) may open a DB connection in a
+    # worker thread; close it so short-lived threads don't leak connections.
     try:
-        return cache.add(lock_key, 1, timeout=REFRESH_LOCK_TTL)
-    except Exception:
-        return True
+        return fn()
+    finally:
+        connection.close()
 
 
-def _set_cooldown(cooldown_key, cooldown_seconds):
-    try:
-        cache.set(cooldown_key, _now_ts(), timeout=cooldown_seconds)
-    except Exception:
-        pass
-
-
-def _cooldown_active(cooldown_key):
-    try:
-        return cache.get(cooldown_key) is not None
-    except Exception:
-        return False
+def _fan_out(calls, deadline_seconds):
+    """Run named zero-arg callables concurrently and collect results that finish before the deadline.
 
+    Sources that fail or are still running when the deadline hits are simply
+    left out of the returned dict; their threads finish in the background.
+    """
+    if not calls:
+        return {}
 
-def _run_async_with_jitter(refresh_callable, lock_key, cooldown_key, cooldown_seconds, jitter_max_seconds=12):
-    """Run refresh callable in a daemon thread with jitter, lock, and cooldown safeguards."""
-    if _cooldown_active(cooldown_key):
-        return False
-    if not _with_refresh_lock(lock_key):
-        return False
+    executor = ThreadPoolExecutor(max_workers=len(calls))
+    futures = {executor.submit(_run_closing_connection, fn): name for name, fn in calls.items()}
+    done, _ = wait(futures, timeout=deadline_seconds)
+    # Don't block on stragglers; their own socket timeouts bound them.
+    executor.shutdown(wait=False, cancel_futures=True)
 
-    def _runner():
+    results = {}
+    for future in done:
         try:
-            # Jitter prevents synchronized thundering herd.
-            time.sleep(random.uniform(0.25, float(jitter_max_seconds)))
-            refresh_callable()
-            _set_cooldown(cooldown_key, cooldown_seconds)
+            results[futures[future]] = future.result()
         except Exception:
-            # Intentionally swallow; stale payload will continue serving.
-            pass
+            continue
+    return results
 
-    thread = threading.Thread(target=_runner, daemon=True)
-    thread.start()
-    return True
+
+def _get_country_or_404(country_code, queryset=None):
+    """get_object_or_404 for a country code; unknown codes are remembered for COUNTRY_MISSING_TTL."""
+    if is_marked_missing("country", country_code):
+        raise Http404("No Country matches the given query.")
+    try:
+        return (queryset if queryset is not None else Country.objects.all()).get(code=country_code)
+    except Country.DoesNotExist:
+        mark_missing("country", country_code, COUNTRY_MISSING_TTL)
+        raise Http404("No Country matches the given query.")
 
 
 def _record_country_visit(country):
@@ -180,7 +158,7 @@ def _serialize_service_provider(provider):
 
 @api_view(["POST"])
 def country_visit_view(request, country_code):
-    country = get_object_or_404(Country, code=country_code.upper())
+    country = _get_country_or_404(country_code.upper())
     _record_country_visit(country)
     stats = CountryVisit.objects.filter(country=country).values_list("visit_count", flat=True).first() or 0
     return Response(_serialize_country_card(country, stats))
@@ -194,6 +172,17 @@ def popular_countries_view(request):
     except (TypeError, ValueError):
         limit = POPULAR_COUNTRIES_LIMIT
 
+    entry = _build_popular_countries.entry(limit)
+    return conditional_response(request, entry_etag(entry), lambda: entry["data"], entry.get("bodies"))
+
+
+@stale_while_revalidate(
+    lambda limit: f"popular_countries_{limit}",
+    fresh_ttl=POPULAR_COUNTRIES_FRESH_TTL,
+    storage_ttl=POPULAR_COUNTRIES_STORAGE_TTL,
+    prerender=True,
+)
+def _build_popular_countries(limit):
     visits = list(
         CountryVisit.objects.select_related("country")
         .filter(visit_count__gt=0)
@@ -214,51 +203,96 @@ def popular_countries_view(request):
         )
         payload.extend(_serialize_country_card(country, 0) for country in fallback_countries)
 
-    return Response(payload)
-
-
-@api_view(["GET"])
-def country_page_view(request, country_code):
-    key = f"country_page_{country_code.upper()}"
-    data = safe_cache_get(key)
-    if data is None:
-        # 1) fetch the country
-        country = get_object_or_404(Country, code=country_code.upper())
-
-        # 2) build a queryset of *only* this country's apps,
-        #    and select_related their category to avoid per-object queries:
-        apps_qs = TravelApp.objects.filter(country=country).select_related("category")
-
-        # 3) prefetch those apps into each category as 'apps_for_country'
-        category_qs = AppCategory.objects.filter(apps__in=apps_qs).distinct().prefetch_related(
-            Prefetch("apps", queryset=apps_qs, to_attr="apps_for_country")
-        )
+    return payload
 
-        # 4) Pass that category_qs into the serializer via context
-        serializer = CountrySerializer(country, context={"categories_qs": category_qs})
-        data = serializer.data
 
-        # 5) your existing UI extras & caching
-        data.update({
-          "search_filter": {
-            "search_placeholder": "Search for apps…",
-            "categories": [c["name"] for c in data["curated_app_categories"]],
-          },
-          "selected_apps_panel": {
-            "selected_apps": [],
-            "generate_qr_button": "Generate QR Code",
-          },
-          "add_to_list_url": "/api/personalized_list/personalized-list/",
-        })
-        safe_cache_set(key, data, CACHE_TTL)
+@stale_while_revalidate(
+    lambda country_code: f"country_page_{country_code}",
+    fresh_ttl=CACHE_TTL,
+    storage_ttl=CACHE_TTL,
+    version=country_cache_generation,
+    prerender=True,
+)
+def _build_country_page(country_code):
+    # Codes already known to be unknown cost no query at all.
+    if is_marked_missing("country", country_code):
+        raise Http404("No Country matches the given query.")
+    # Redis miss: the materialized snapshot is one indexed row away.
+    data = read_country_snapshot(country_code)
+    if data is not None:
+        return data
+    # Existence first, so unknown codes never get a snapshot row; the version
+    # is read before rendering so a concurrent edit leaves the snapshot stale.
+    _get_country_or_404(country_code)
+    version = country_snapshot_version(country_code)
+    data = _render_country_page(country_code)
+    save_country_snapshot(country_code, data, version)
+    return data
+
+
+def refresh_country_snapshot(country_code):
+    """Rebuild a country's page snapshot; dropped if the country no longer exists."""
+    if not Country.objects.filter(code=country_code).exists():
+        delete_country_snapshot(country_code)
+        return
+    version = country_snapshot_version(country_code)
+    save_country_snapshot(country_code, _render_country_page(country_code), version)
+
+
+def _render_country_page(country_code):
+    # 1) fetch the country
+    country = _get_country_or_404(country_code)
+
+    # 2-4) country, categories and apps
+    if fast_serializers.enabled():
+        data = fast_serializers.serialize_country_page(country)
+    else:
+        data = _serialize_country_page(country)
+
+    # 5) your existing UI extras
+    data.update({
+      "search_filter": {
+        "search_placeholder": "Search for apps…",
+        "categories": [c["name"] for c in data["curated_app_categories"]],
+      },
+      "selected_apps_panel": {
+        "selected_apps": [],
+        "generate_qr_button": "Generate QR Code",
+      },
+      "add_to_list_url": "/api/personalized_list/personalized-list/",
+    })
+    return data
+
+
+def _serialize_country_page(country):
+    # 2) build a queryset of *only* this country's apps, with everything
+    #    TravelAppSerializer reads loaded up front (no per-app queries):
+    apps_qs = TravelAppSerializer.prefetch(TravelApp.objects.filter(country=country).order_by("id"))
+
+    # 3) prefetch those apps into each category as 'apps_for_country'
+    category_qs = AppCategory.objects.filter(apps__country=country).distinct().order_by("id").prefetch_related(
+        Prefetch("apps", queryset=apps_qs, to_attr="apps_for_country")
+    )
 
-    return Response(data)
+    # 4) Pass that category_qs into the serializer via context
+    serializer = CountrySerializer(country, context={"categories_qs": category_qs})
+    return serializer.data
 
 
 @api_view(["GET"])
-def country_services_view(request, country_code):
-    country = get_object_or_404(Country, code=country_code.upper())
-    visit_count = CountryVisit.objects.filter(country=country).values_list("visit_count", flat=True).first() or 0
+def country_page_view(request, country_code):
+    entry = _build_country_page.entry(country_code.upper())
+    return conditional_response(request, entry_etag(entry), lambda: entry["data"], entry.get("bodies"))
+
+
+@stale_while_revalidate(
+    lambda country_code: f"country_services_{country_code}",
+    fresh_ttl=CACHE_TTL,
+    storage_ttl=CACHE_TTL,
+    version=country_cache_generation,
+)
+def _build_country_services(country_code):
+    country = _get_country_or_404(country_code)
     providers = CountryServiceProvider.objects.filter(country=country).order_by("section", "-is_featured", "name")
     grouped = {key: [] for key in SERVICE_SECTION_META.keys()}
 
@@ -279,61 +313,107 @@ def country_services_view(request, country_code):
                 "providers": grouped.get(key, []),
             }
         )
+    return sections
 
-    return Response(
-        {
-            "country": _serialize_country_card(country, visit_count),
-            "sections": sections,
-        }
+
+def _country_services_card(country_code):
+    # The visit counter changes on every visit, so the card is read live.
+    country = _get_country_or_404(country_code, Country.objects.select_related("visit_stats"))
+    visit_stats = getattr(country, "visit_stats", None)
+    return _serialize_country_card(country, visit_stats.visit_count if visit_stats else 0)
+
+
+def _country_services_payload(country_code, sections):
+    return {"country": _country_services_card(country_code), "sections": sections}
+
+
+@api_view(["GET"])
+def country_services_view(request, country_code):
+    cc = country_code.upper()
+    entry = _build_country_services.entry(cc)
+    card = _country_services_card(cc)
+    return conditional_response(
+        request,
+        combine_etags(entry_etag(entry), content_etag(card)),
+        lambda: {"country": card, "sections": entry["data"]},
     )
 
 
 # ✅ API to fetch all categories
 # @method_decorator(cache_page(60 * 15), name="dispatch")  # 15m cache
 class AppCategoryListView(generics.ListAPIView):
-    queryset = AppCategory.objects.all()
+    queryset = AppCategory.objects.prefetch_related(
+        Prefetch("apps", queryset=TravelAppSerializer.prefetch(TravelApp.objects.all()), to_attr="category_apps")
+    )
     serializer_class = AppCategorySerializer
 
 
 # ✅ API to fetch all travel apps (with optional filtering by category)
 
+@stale_while_revalidate(
+    lambda country_code: f"country_apps_{country_code}",
+    fresh_ttl=CACHE_TTL,
+    storage_ttl=CACHE_TTL,
+    version=country_cache_generation,
+    prerender=True,
+)
+def _build_country_apps(country_code):
+    # Unknown codes 404 (and are negative-cached) rather than caching an empty list.
+    country = _get_country_or_404(country_code, Country.objects.only("id"))
+    qs = TravelApp.objects.filter(country=country).order_by("-is_sponsored", "name")
+    if fast_serializers.enabled():
+        return fast_serializers.serialize_travel_apps(qs)
+    return TravelAppSerializer(TravelAppSerializer.prefetch(qs), many=True).data
+
+
 class TravelAppListView(generics.ListAPIView):
     serializer_class = TravelAppSerializer
-    CACHE_TTL = 15*60
 
     def list(self, request, *args, **kwargs):
         cc = self.kwargs["country_code"].upper()
-        key = f"country_apps_{cc}"
-        apps_data = safe_cache_get(key)
-        if apps_data is None:
-            qs = TravelApp.objects.filter(country__code=cc)
-            cat = request.query_params.get("category")
-            if cat:
-                qs = qs.filter(category__name__iexact=cat)
-            qs = qs.order_by("-is_sponsored", "name")
-            apps_data = TravelAppSerializer(qs, many=True).data
-            safe_cache_set(key, apps_data, self.CACHE_TTL)
-        return Response(apps_data)
+        # The full list is cached once; the category filter is applied below.
+        entry = _build_country_apps.entry(cc)
+        cat = str(request.query_params.get("category") or "").lower()
+        if not cat:
+            return conditional_response(request, entry_etag(entry), lambda: entry["data"], entry.get("bodies"))
+        return conditional_response(
+            request,
+            combine_etags(entry_etag(entry), cat),
+            lambda: [app for app in entry["data"] if str(app.get("category") or "").lower() == cat],
+        )
+
+
+@stale_while_revalidate(
+    lambda country_code: f"country_essentials_{country_code}",
+    fresh_ttl=CACHE_TTL,
+    storage_ttl=CACHE_TTL,
+    version=country_cache_generation,
+    # The body sent when no origin country is given.
+    prerender=lambda essential: dict(essential, origin_assistance=None),
+)
+def _build_country_essentials(country_code):
+    country = _get_country_or_404(country_code)
+    if fast_serializers.enabled():
+        essential = fast_serializers.serialize_essentials(country)
+    else:
+        essential = EssentialsSerializer(country).data
+    essential["embassy_contacts"] = _load_embassy_contacts(country_code)
+    return essential
 
 
 @api_view(["GET"])
 def country_essentials_view(request, country_code):
     country_code = country_code.upper()
     origin_code = str(request.query_params.get("origin_country") or "").strip().upper()
-    key = f"country_essentials_{country_code}"
-    essential = safe_cache_get(key)
-    if essential is None:
-        country = get_object_or_404(Country, code=country_code)
-        essential = EssentialsSerializer(country).data
-        essential["embassy_contacts"] = _load_embassy_contacts(country_code)
-        safe_cache_set(key, essential, 2*60*60)
-    elif "embassy_contacts" not in essential:
-        essential["embassy_contacts"] = _load_embassy_contacts(country_code)
-        safe_cache_set(key, essential, 2*60*60)
-
-    payload = dict(essential)
-    payload["origin_assistance"] = _get_or_fetch_origin_assistance(origin_code)
-    return Response(payload)
+    essential = _build_country_essentials.entry(country_code)
+    origin = _build_origin_assistance.entry(origin_code) if origin_code else None
+
+    return conditional_response(
+        request,
+        combine_etags(entry_etag(essential), entry_etag(origin) if origin else ""),
+        lambda: dict(essential["data"], origin_assistance=origin["data"] if origin else None),
+        None if origin_code else essential.get("bodies"),
+    )
 
 
 ORIGIN_ASSISTANCE_SEED = {
@@ -400,8 +480,6 @@ def _serialize_origin_assistance(profile):
 
 
 def _fetch_origin_assistance_from_wikidata(country_code):
-    from urllib.request import Request, urlopen
-
     query = f'''
     SELECT ?countryLabel ?ministryLabel ?website ?phone ?hqLabel WHERE {{
       ?country wdt:P297 "{country_code}".
@@ -415,10 +493,12 @@ def _fetch_origin_assistance_from_wikidata(country_code):
     '''
 
     endpoint = f"https://query.wikidata.org/sparql?format=json&query={quote(query)}"
-    req = Request(endpoint, headers={"Accept": "application/sparql-results+json", "User-Agent": "TripBozo/1.0 (origin-assistance)"})
-
-    with urlopen(req, timeout=10) as response:
-        payload = json.loads(response.read().decode("utf-8"))
+    payload = fetch_json(
+        endpoint,
+        headers={"Accept": "application/sparql-results+json", "User-Agent": "TripBozo/1.0 (origin-assistance)"},
+        timeout=10,
+        source="wikidata",
+    )
 
     bindings = payload.get("results", {}).get("bindings", [])
     if not bindings:
@@ -446,8 +526,6 @@ def _fetch_origin_assistance_from_wikidata(country_code):
 
 def _fetch_origin_assistance_from_nominatim(country_name):
     """Fallback source using OSM Nominatim POI metadata for foreign affairs offices."""
-    from urllib.request import Request, urlopen
-
     if not country_name:
         return None
 
@@ -462,17 +540,16 @@ def _fetch_origin_assistance_from_nominatim(country_name):
         }
     )
     endpoint = f"https://nominatim.openstreetmap.org/search?{params}"
-    req = Request(
+    payload = fetch_json(
         endpoint,
         headers={
             "Accept": "application/json",
             "User-Agent": "TripBozo/1.0 (origin-assistance)",
         },
+        timeout=12,
+        source="nominatim",
     )
 
-    with urlopen(req, timeout=12) as response:
-        payload = json.loads(response.read().decode("utf-8"))
-
     if not isinstance(payload, list) or not payload:
         return None
 
@@ -518,12 +595,20 @@ def _fetch_origin_assistance_from_nominatim(country_name):
     return best
 
 
-def _get_or_fetch_origin_assistance(origin_code):
-    if not origin_code:
+@stale_while_revalidate(
+    lambda origin_code: f"origin_assistance_{origin_code}",
+    fresh_ttl=ORIGIN_ASSISTANCE_FRESH_TTL,
+    storage_ttl=ORIGIN_ASSISTANCE_STORAGE_TTL,
+    jitter=5,
+    priority=PRIORITY_LOW,
+)
+def _build_origin_assistance(origin_code):
+    # Nothing is cached for a None result, so misses are remembered separately.
+    if is_marked_missing("origin_assistance", origin_code):
         return None
-
     country = Country.objects.filter(code=origin_code).first()
     if not country:
+        mark_missing("origin_assistance", origin_code, ORIGIN_ASSISTANCE_MISSING_TTL)
         return None
 
     existing = OriginCountryAssistance.objects.filter(country=country).first()
@@ -531,10 +616,14 @@ def _get_or_fetch_origin_assistance(origin_code):
         return _serialize_origin_assistance(existing)
 
     fetched = ORIGIN_ASSISTANCE_SEED.get(origin_code)
+    # Only a genuine "nothing found" is remembered; an upstream error or an
+    # open breaker (SourceUnavailable) should be retried on the next request.
+    upstream_failed = False
     if fetched is None:
         try:
             fetched = _fetch_origin_assistance_from_wikidata(origin_code)
         except Exception:
+            upstream_failed = True
             fetched = None
 
     # Second web fallback: OSM Nominatim, useful when Wikidata is sparse.
@@ -542,9 +631,12 @@ def _get_or_fetch_origin_assistance(origin_code):
         try:
             fetched = _fetch_origin_assistance_from_nominatim(country.name)
         except Exception:
+            upstream_failed = True
             fetched = None
 
     if not fetched:
+        if not upstream_failed:
+            mark_missing("origin_assistance", origin_code, ORIGIN_ASSISTANCE_MISSING_TTL)
         return None
 
     profile = OriginCountryAssistance.objects.create(
@@ -616,27 +708,6 @@ def _load_embassy_contacts(country_code):
     return contacts
 
 
-def _strip_xml_text(value=""):
-    return (
-        str(value)
-        .replace("&nbsp;", " ")
-        .replace("&amp;", "&")
-        .replace("&quot;", '"')
-        .replace("&#39;", "'")
-    )
-
-
-def _extract_rss_tag(xml, tag):
-    match = re.search(rf"<{tag}>([\s\S]*?)</{tag}>", xml, re.IGNORECASE)
-    if not match:
-        return ""
-    value = match.group(1)
-    value = re.sub(r"<!\[CDATA\[([\s\S]*?)\]\]>", r"\1", value)
-    value = re.sub(r"<[^>]*>", " ", value)
-    value = re.sub(r"\s+", " ", value).strip()
-    return _strip_xml_text(value)
-
-
 def _classify_update(title="", description=""):
     text = f"{title} {description}".lower()
     if re.search(r"storm|weather|hurricane|typhoon|cyclone|flood|wildfire|earthquake", text):
@@ -717,10 +788,16 @@ def _temperature_band_condition(temp_value):
     return "Cold conditions"
 
 
-def _fetch_country_weather(country_name, country_code=None):
-    from urllib.request import Request, urlopen
+def _lookup_country_latlng(country_name, country_code=None):
+    """Centroid from the bundled geo table, falling back to restcountries for unknown codes.
+
+    None when restcountries couldn't be reached or doesn't know the country;
+    an empty tuple when it knows the country but has no coordinates for it.
+    """
+    centroid = country_centroid(country_code)
+    if centroid:
+        return centroid
 
-    country_payload = None
     endpoints = []
     if country_code:
         endpoints.append(f"https://restcountries.com/v3.1/alpha/{quote(str(country_code))}")
@@ -728,34 +805,26 @@ def _fetch_country_weather(country_name, country_code=None):
 
     for endpoint in endpoints:
         try:
-            req = Request(endpoint, headers={"Accept": "application/json", "User-Agent": "TripBozo/1.0 (travel-updates)"})
-            with urlopen(req, timeout=8) as response:
-                payload = json.loads(response.read().decode("utf-8", errors="ignore"))
-            if isinstance(payload, list) and payload:
-                country_payload = payload[0]
-                break
-            if isinstance(payload, dict):
-                country_payload = payload
-                break
+            payload = fetch_json(
+                endpoint,
+                headers={"Accept": "application/json", "User-Agent": "TripBozo/1.0 (travel-updates)"},
+                source="restcountries",
+            )
         except Exception:
             continue
+        country_payload = payload[0] if isinstance(payload, list) and payload else payload
+        if not isinstance(country_payload, dict):
+            continue
+        latlng = country_payload.get("latlng") or []
+        if isinstance(latlng, list) and len(latlng) >= 2:
+            return latlng[0], latlng[1]
+        return ()
+    return None
 
-    if not isinstance(country_payload, dict):
-        return {}
-
-    latlng = country_payload.get("latlng") or []
-    if not isinstance(latlng, list) or len(latlng) < 2:
-        return {
-            "location": str(country_name).strip(),
-            "condition": "Weather unavailable",
-            "conditions": ["Weather unavailable"],
-            "emoji": "🌡️",
-            "source": "restcountries",
-        }
 
-    latitude, longitude = latlng[0], latlng[1]
+def _weather_sample_points(latitude, longitude):
     # Sample multiple points around the country's centroid to approximate country-wide conditions.
-    sample_points = [
+    return [
         (latitude, longitude),
         (max(-60.0, min(75.0, latitude + 2.5)), longitude),
         (max(-60.0, min(75.0, latitude - 2.5)), longitude),
@@ -763,26 +832,47 @@ def _fetch_country_weather(country_name, country_code=None):
         (latitude, max(-179.0, min(179.0, longitude - 3.0))),
     ]
 
+
+def _fetch_current_weather(points):
+    """Current conditions for many (lat, lon) points in one open-meteo request.
+
+    Returns a list aligned with ``points``; entries are None when unavailable.
+    """
+    if not points:
+        return []
+
+    weather_url = (
+        "https://api.open-meteo.com/v1/forecast?"
+        f"latitude={','.join(str(lat) for lat, _ in points)}"
+        f"&longitude={','.join(str(lon) for _, lon in points)}"
+        "&current=temperature_2m,weather_code,wind_speed_10m&timezone=auto"
+    )
+    try:
+        payload = fetch_json(
+            weather_url,
+            headers={"Accept": "application/json", "User-Agent": "TripBozo/1.0 (travel-updates)"},
+            source="open_meteo",
+        )
+    except Exception:
+        return [None] * len(points)
+
+    # A single coordinate returns an object, several return a list.
+    locations = payload if isinstance(payload, list) else [payload]
+    currents = [(location or {}).get("current") if isinstance(location, dict) else None for location in locations]
+    return (currents + [None] * len(points))[: len(points)]
+
+
+def _summarize_weather(country_name, currents):
     weather_conditions = []
     climate_conditions = []
     primary_condition = None
     primary_emoji = "🌤️"
     wind_speeds = []
 
-    for idx, (sample_lat, sample_lon) in enumerate(sample_points):
-        weather_url = (
-            "https://api.open-meteo.com/v1/forecast?"
-            f"latitude={sample_lat}&longitude={sample_lon}&current=temperature_2m,weather_code,wind_speed_10m&timezone=auto"
-        )
-
-        try:
-            req = Request(weather_url, headers={"Accept": "application/json", "User-Agent": "TripBozo/1.0 (travel-updates)"})
-            with urlopen(req, timeout=8) as response:
-                payload = json.loads(response.read().decode("utf-8", errors="ignore"))
-        except Exception:
+    for idx, current in enumerate(currents):
+        if current is None:
             continue
 
-        current = payload.get("current") or {}
         weather_code = current.get("weather_code")
         weather_text, weather_emoji = _weather_code_info(weather_code)
         if weather_text:
@@ -824,46 +914,46 @@ def _fetch_country_weather(country_name, country_code=None):
     }
 
 
-def _phrase_pattern(phrase):
-    parts = [re.escape(part) for part in str(phrase).strip().split() if part]
-    if not parts:
-        return None
-    separator = r"\s+"
-    return rf"\b{separator.join(parts)}\b"
-
-
-def _country_focus_terms(country_name, country_code=None):
-    base_terms = [str(country_name).strip()]
-    alias_map = {
-        "united states": ["usa", "u.s.", "us", "america", "united states"],
-        "united kingdom": ["uk", "u.k.", "britain", "great britain", "united kingdom"],
-        "south korea": ["korea", "republic of korea", "south korea"],
-        "north korea": ["dprk", "north korea"],
-        "united arab emirates": ["uae", "u.a.e.", "emirates", "united arab emirates"],
-        "czech republic": ["czechia", "czech republic"],
-        "ivory coast": ["cote d'ivoire", "ivory coast"],
+def _weather_unavailable(country_name):
+    # restcountries knows the country but has no coordinates to sample.
+    return {
+        "location": str(country_name).strip(),
+        "condition": "Weather unavailable",
+        "conditions": ["Weather unavailable"],
+        "emoji": "🌡️",
+        "source": "restcountries",
     }
 
-    normalized = str(country_name).strip().lower()
-    for alias in alias_map.get(normalized, []):
-        if alias.lower() not in [term.lower() for term in base_terms]:
-            base_terms.append(alias)
 
-    if country_code:
-        code = str(country_code).strip().lower()
-        if code and code not in [term.lower() for term in base_terms]:
-            base_terms.append(code)
+def fetch_weather_for_countries(countries):
+    """Weather payloads keyed by country code, using one open-meteo request for the whole batch."""
+    sampled = []
+    points = []
+    weather = {}
+    for country in countries:
+        latlng = _lookup_country_latlng(country.name, country.code)
+        if not latlng:
+            weather[country.code] = {} if latlng is None else _weather_unavailable(country.name)
+            continue
+        country_points = _weather_sample_points(float(latlng[0]), float(latlng[1]))
+        sampled.append((country, len(points), len(country_points)))
+        points.extend(country_points)
 
-    return base_terms
+    currents = _fetch_current_weather(points)
+    for country, offset, count in sampled:
+        weather[country.code] = _summarize_weather(country.name, currents[offset:offset + count])
+    return weather
 
 
-def _text_contains_any(text, phrases):
-    haystack = str(text or "")
-    for phrase in phrases:
-        pattern = _phrase_pattern(phrase)
-        if pattern and re.search(pattern, haystack, re.IGNORECASE):
-            return True
-    return False
+def _fetch_country_weather(country_name, country_code=None):
+    latlng = _lookup_country_latlng(country_name, country_code)
+    if latlng is None:
+        return {}
+    if not latlng:
+        return _weather_unavailable(country_name)
+
+    points = _weather_sample_points(float(latlng[0]), float(latlng[1]))
+    return _summarize_weather(country_name, _fetch_current_weather(points))
 
 
 def _normalize_update_key(item):
@@ -907,22 +997,53 @@ def _merge_update_items(items):
     return list(merged.values())
 
 
-def _country_terms_with_aliases(country_name, country_code=None):
-    terms = _country_focus_terms(country_name, country_code)
-    expanded = list(terms)
-    for term in terms:
-        for part in str(term).replace("/", " ").replace("-", " ").split():
-            if len(part) > 2 and part.lower() not in [existing.lower() for existing in expanded]:
-                expanded.append(part)
-    return expanded
+NEWS_TRAVEL_SIGNAL_RE = re.compile(
+    r"travel|tourism|tourist|airport|visa|flight|rail|weather|storm|festival|event|parade|holiday|emergency|advisory|alert|warning|caution|disruption|strike|closure|delay",
+    re.IGNORECASE,
+)
+ADVISORY_SIGNAL_RE = re.compile(
+    r"travel|advisory|alert|warning|security|health|outbreak|entry|visa|border|restriction|closure|evacuation",
+    re.IGNORECASE,
+)
+
+
+def _score_news_entry(entry, matcher, label, source_name):
+    title = entry["title"]
+    description = entry["description"]
+    haystack = f"{title} {description}"
+
+    title_has_country = matcher.search(title)
+    description_has_country = matcher.search(description)
+    if not (title_has_country or description_has_country):
+        return None
+
+    relevance = 0
+    if title_has_country:
+        relevance += 4
+    if description_has_country:
+        relevance += 2
+    if NEWS_TRAVEL_SIGNAL_RE.search(haystack):
+        relevance += 1
+
+    return {
+        "title": title,
+        "link": entry["link"],
+        "description": description,
+        "pubDate": entry["pubDate"],
+        "badge": label,
+        "relevance": relevance,
+        "source": source_name,
+    }
 
 
 def _query_country_updates(country_name, country_code=None, label="Travel news", keywords=None, source_name="google_news"):
-    from urllib.request import Request, urlopen
+    with SourceReservation(source_name) as reservation:
+        if not reservation:
+            return []
+        return _query_country_news(reservation, country_name, country_code, label, keywords, source_name)
 
-    if not _reserve_source_call(source_name):
-        return []
 
+def _query_country_news(reservation, country_name, country_code, label, keywords, source_name):
     keywords = [str(keyword).strip() for keyword in (keywords or []) if str(keyword).strip()]
     if keywords:
         keyword_group = " OR ".join([f'"{keyword}"' if " " in keyword else keyword for keyword in keywords])
@@ -930,108 +1051,46 @@ def _query_country_updates(country_name, country_code=None, label="Travel news",
     else:
         query = f'"{country_name}"'
     rss_url = f"https://news.google.com/rss/search?q={quote(query)}&hl=en-US&gl=US&ceid=US:en"
-    req = Request(rss_url, headers={"Accept": "application/rss+xml, application/xml, text/xml"})
 
+    matcher = get_country_matcher(country_name, country_code)
+    items = []
     try:
-        with urlopen(req, timeout=8) as response:
-            xml = response.read().decode("utf-8", errors="ignore")
+        # Not conditional: parsing stops early, so there is never a full body to revalidate against.
+        with open_url(
+            rss_url,
+            headers={"Accept": "application/rss+xml, application/xml, text/xml"},
+            source=source_name,
+            conditional=False,
+            reservation=reservation,
+        ) as response:
+            # Items are parsed as they stream in; stop reading once we have enough.
+            for entry in iter_rss_items(response):
+                item = _score_news_entry(entry, matcher, label, source_name)
+                if item is None:
+                    continue
+                items.append(item)
+                if len(items) >= 10:
+                    break
     except Exception:
-        return []
-
-    country_terms = _country_terms_with_aliases(country_name, country_code)
-    items = []
-    for match in re.finditer(r"<item>([\s\S]*?)</item>", xml):
-        chunk = match.group(1)
-        title = _extract_rss_tag(chunk, "title")
-        if not title:
-            continue
-        link = _extract_rss_tag(chunk, "link")
-        description = _extract_rss_tag(chunk, "description")
-        pub_date = _extract_rss_tag(chunk, "pubDate")
-        haystack = f"{title} {description}"
-
-        title_has_country = _text_contains_any(title, country_terms)
-        description_has_country = _text_contains_any(description, country_terms)
-        if not (title_has_country or description_has_country):
-            continue
-
-        relevance = 0
-        if title_has_country:
-            relevance += 4
-        if description_has_country:
-            relevance += 2
-        if re.search(r"travel|tourism|tourist|airport|visa|flight|rail|weather|storm|festival|event|parade|holiday|emergency|advisory|alert|warning|caution|disruption|strike|closure|delay", haystack, re.IGNORECASE):
-            relevance += 1
-
-        items.append(
-            {
-                "title": title,
-                "link": link,
-                "description": description,
-                "pubDate": pub_date,
-                "badge": label,
-                "relevance": relevance,
-                "source": source_name,
-            }
-        )
-        if len(items) >= 10:
-            break
+        return items
 
     return items
 
 
 def _fetch_gov_advisories(country_name, country_code=None):
-    from urllib.request import Request, urlopen
-
-    country_terms = _country_terms_with_aliases(country_name, country_code)
-    travel_alert_regex = re.compile(
-        r"travel|advisory|alert|warning|security|health|outbreak|entry|visa|border|restriction|closure|evacuation",
-        re.IGNORECASE,
-    )
-
-    sources = [
-        {
-            "name": "gov_state",
-            "url": "https://travel.state.gov/_res/rss/TAsTWs.xml",
-            "source_label": "U.S. State Dept",
-        },
-        {
-            "name": "gov_cdc",
-            "url": "https://wwwnc.cdc.gov/travel/rss/notices",
-            "source_label": "CDC Travel Notices",
-        },
-    ]
+    matcher = get_country_matcher(country_name, country_code)
 
     items = []
-    for source in sources:
-        if not _reserve_source_call(source["name"]):
-            continue
-
-        try:
-            req = Request(
-                source["url"],
-                headers={
-                    "Accept": "application/rss+xml, application/xml, text/xml",
-                    "User-Agent": "TripBozo/1.0 (travel-updates)",
-                },
-            )
-            with urlopen(req, timeout=8) as response:
-                xml = response.read().decode("utf-8", errors="ignore")
-        except Exception:
-            continue
-
-        for match in re.finditer(r"<item>([\s\S]*?)</item>", xml):
-            chunk = match.group(1)
-            title = _extract_rss_tag(chunk, "title")
-            if not title:
-                continue
-            link = _extract_rss_tag(chunk, "link")
-            description = _extract_rss_tag(chunk, "description")
-            pub_date = _extract_rss_tag(chunk, "pubDate")
+    for feed in GOV_ADVISORY_FEEDS:
+        # Feeds are shared across countries; only a few indexed candidates need a phrase check.
+        snapshot = get_feed_snapshot(feed)
+        for entry in candidate_items(snapshot, matcher.terms):
+            title = entry["title"]
+            description = entry["description"]
 
             haystack = f"{title} {description}"
-            title_has_country = _text_contains_any(title, country_terms)
-            description_has_country = _text_contains_any(description, country_terms)
+            title_has_country = matcher.search(title)
+            description_has_country = matcher.search(description)
             if not (title_has_country or description_has_country):
                 continue
 
@@ -1040,18 +1099,18 @@ def _fetch_gov_advisories(country_name, country_code=None):
                 relevance += 5
             if description_has_country:
                 relevance += 3
-            if travel_alert_regex.search(haystack):
+            if ADVISORY_SIGNAL_RE.search(haystack):
                 relevance += 2
 
             items.append(
                 {
                     "title": title,
-                    "link": link,
+                    "link": entry["link"],
                     "description": description,
-                    "pubDate": pub_date,
+                    "pubDate": entry["pubDate"],
                     "badge": "Government advisory",
                     "relevance": relevance,
-                    "source": source["source_label"],
+                    "source": feed["source_label"],
                 }
             )
 
@@ -1062,47 +1121,28 @@ def _fetch_gov_advisories(country_name, country_code=None):
 
 
 def _fetch_eonet_updates(country_name, country_code=None):
-    from urllib.request import Request, urlopen
-
-    if not _reserve_source_call("eonet"):
+    snapshot = get_eonet_snapshot()
+    if not snapshot:
         return []
 
-    endpoint = "https://eonet.gsfc.nasa.gov/api/v3/events?status=open&limit=50"
-    req = Request(endpoint, headers={"Accept": "application/json", "User-Agent": "TripBozo/1.0 (travel-updates)"})
-
-    try:
-        with urlopen(req, timeout=8) as response:
-            payload = json.loads(response.read().decode("utf-8", errors="ignore"))
-    except Exception:
-        return []
+    code = str(country_code or "").strip().upper()
+    if code and country_bounds(code):
+        # Matched by event coordinates against the country's bounding boxes.
+        events = snapshot["by_country"].get(code, [])
+    else:
+        # No geometry for this country; fall back to matching event text.
+        matcher = get_country_matcher(country_name, country_code)
+        events = [event for event in snapshot["events"] if matcher.search(f"{event['title']} {event['description']}")]
 
-    country_terms = _country_terms_with_aliases(country_name, country_code)
     items = []
-    for event in payload.get("events", [])[:50]:
-        title = str(event.get("title") or "").strip()
-        description = str(event.get("description") or "").strip()
-        if not title and not description:
-            continue
-
-        haystack = f"{title} {description} {json.dumps(event.get('categories', []), ensure_ascii=False)}"
-        if not _text_contains_any(haystack, country_terms):
-            continue
-
-        categories = event.get("categories") or []
-        category_names = " ".join([str(cat.get("title") or cat.get("id") or "") for cat in categories])
-        badge = "Weather / emergency"
-        if re.search(r"fire|wildfire|volcano|earthquake|flood|storm|drought|landslide|cyclone|typhoon", f"{title} {description} {category_names}", re.IGNORECASE):
-            badge = "Weather / emergency"
-        elif re.search(r"ash|eruption|smoke|eruption", f"{title} {description} {category_names}", re.IGNORECASE):
-            badge = "Weather / emergency"
-
+    for event in events:
         items.append(
             {
-                "title": title,
-                "link": str(event.get("link") or "https://eonet.gsfc.nasa.gov/").strip(),
-                "description": description,
-                "pubDate": str(event.get("geometry", [{}])[0].get("date") or "").strip(),
-                "badge": badge,
+                "title": event["title"],
+                "link": event["link"],
+                "description": event["description"],
+                "pubDate": event["date"],
+                "badge": "Weather / emergency",
                 "relevance": 5,
                 "source": "eonet",
             }
@@ -1111,40 +1151,47 @@ def _fetch_eonet_updates(country_name, country_code=None):
     return items[:10]
 
 
-def _fetch_travel_updates(country_name, country_code=None):
-    google_news_items = []
-    google_news_items.extend(
-        _query_country_updates(
-            country_name,
-            country_code,
-            label="Travel news",
-            keywords=["travel", "tourism", "tourist", "airport", "visa", "flight", "rail", "advisory"],
-            source_name="google_news",
-        )
-    )
-    google_news_items.extend(
-        _query_country_updates(
-            country_name,
-            country_code,
-            label="Weather / emergency",
-            keywords=["weather", "climate", "storm", "flood", "cyclone", "typhoon", "earthquake", "wildfire", "heatwave", "warning", "alert"],
-            source_name="google_news",
-        )
-    )
-    google_news_items.extend(
-        _query_country_updates(
-            country_name,
-            country_code,
-            label="Festival / crowd",
-            keywords=["festival", "event", "parade", "holiday", "concert", "carnival", "fair", "tourist season"],
-            source_name="google_news",
+def _fetch_travel_updates(country_name, country_code=None, deadline_seconds=TRAVEL_UPDATES_FETCH_DEADLINE):
+    news_queries = [
+        (
+            "news_travel",
+            "Travel news",
+            ["travel", "tourism", "tourist", "airport", "visa", "flight", "rail", "advisory"],
+        ),
+        (
+            "news_weather",
+            "Weather / emergency",
+            ["weather", "climate", "storm", "flood", "cyclone", "typhoon", "earthquake", "wildfire", "heatwave", "warning", "alert"],
+        ),
+        (
+            "news_festival",
+            "Festival / crowd",
+            ["festival", "event", "parade", "holiday", "concert", "carnival", "fair", "tourist season"],
+        ),
+    ]
+
+    calls = {}
+    for name, label, keywords in news_queries:
+        calls[name] = (
+            lambda label=label, keywords=keywords: _query_country_updates(
+                country_name,
+                country_code,
+                label=label,
+                keywords=keywords,
+                source_name="google_news",
+            )
         )
-    )
+    calls["eonet"] = lambda: _fetch_eonet_updates(country_name, country_code)
+    calls["gov_advisories"] = lambda: _fetch_gov_advisories(country_name, country_code)
+
+    results = _fan_out(calls, deadline_seconds)
 
-    eonet_items = _fetch_eonet_updates(country_name, country_code)
-    gov_advisory_items = _fetch_gov_advisories(country_name, country_code)
+    # Merge in a stable source order so tie-breaking matches the sequential version.
+    collected = []
+    for name in calls:
+        collected.extend(results.get(name) or [])
 
-    items = _merge_update_items(google_news_items + eonet_items + gov_advisory_items)
+    items = _merge_update_items(collected)
     items = sorted(items, key=lambda x: x.get("relevance", 0), reverse=True)
 
     for item in items:
@@ -1183,11 +1230,14 @@ def _tokenize_review_words(reviews):
 
 
 def _fetch_reddit_mentions(app, country_name):
-    from urllib.request import Request, urlopen
+    # One reservation covers all three searches.
+    with SourceReservation("reddit") as reservation:
+        if not reservation:
+            return []
+        return _search_reddit_mentions(reservation, app, country_name)
 
-    if not _reserve_source_call("reddit"):
-        return []
 
+def _search_reddit_mentions(reservation, app, country_name):
     queries = [
         f'{app.name} {country_name}',
         f'{app.name} travel',
@@ -1201,17 +1251,16 @@ def _fetch_reddit_mentions(app, country_name):
             + quote(query)
             + "&sort=new&limit=10&t=year"
         )
-        req = Request(
-            search_url,
-            headers={
-                "Accept": "application/json",
-                "User-Agent": "TripBozo/1.0 (traveler-insights)",
-            },
-        )
-
         try:
-            with urlopen(req, timeout=8) as response:
-                payload = json.loads(response.read().decode("utf-8", errors="ignore"))
+            payload = fetch_json(
+                search_url,
+                headers={
+                    "Accept": "application/json",
+                    "User-Agent": "TripBozo/1.0 (traveler-insights)",
+                },
+                source="reddit",
+                reservation=reservation,
+            )
         except Exception:
             continue
 
@@ -1238,27 +1287,31 @@ def _fetch_reddit_mentions(app, country_name):
 
 
 def _fetch_apple_reviews(app):
-    from urllib.request import Request, urlopen
-
     ios_app_id = _extract_ios_app_id(app.ios_link)
-    if not ios_app_id or not _reserve_source_call("apple_app_store"):
+    if not ios_app_id:
         return []
+    # One reservation covers both pages.
+    with SourceReservation("apple_app_store") as reservation:
+        if not reservation:
+            return []
+        return _fetch_apple_review_pages(reservation, ios_app_id)
 
+
+def _fetch_apple_review_pages(reservation, ios_app_id):
     reviews = []
     # Public customer reviews RSS feed (free, unauthenticated).
     for page in (1, 2):
         rss_url = f"https://itunes.apple.com/rss/customerreviews/page={page}/id{ios_app_id}/sortby=mostrecent/json"
-        req = Request(
-            rss_url,
-            headers={
-                "Accept": "application/json",
-                "User-Agent": "TripBozo/1.0 (traveler-insights)",
-            },
-        )
-
         try:
-            with urlopen(req, timeout=8) as response:
-                payload = json.loads(response.read().decode("utf-8", errors="ignore"))
+            payload = fetch_json(
+                rss_url,
+                headers={
+                    "Accept": "application/json",
+                    "User-Agent": "TripBozo/1.0 (traveler-insights)",
+                },
+                source="apple_app_store",
+                reservation=reservation,
+            )
         except Exception:
             continue
 
@@ -1406,17 +1459,18 @@ def _fetch_live_reviews(app):
     android_app_id = _extract_android_app_id(app.android_link)
     ios_app_id = _extract_ios_app_id(app.ios_link)
 
-    if android_app_id and _reserve_source_call("google_play"):
+    if android_app_id and reserve_source_call("google_play"):
         try:
             from google_play_scraper import Sort, reviews as gp_reviews
 
-            result, _ = gp_reviews(
-                android_app_id,
-                lang="en",
-                country="us",
-                sort=Sort.NEWEST,
-                count=40,
-            )
+            with source_guard("google_play"):
+                result, _ = gp_reviews(
+                    android_app_id,
+                    lang="en",
+                    country="us",
+                    sort=Sort.NEWEST,
+                    count=40,
+                )
             for entry in result or []:
                 text = str(entry.get("content") or "").strip()
                 if not text:
@@ -1428,6 +1482,8 @@ def _fetch_live_reviews(app):
                         "source": "google_play",
                     }
                 )
+        except SourceUnavailable:
+            release_source_call("google_play")
         except Exception:
             pass
 
@@ -1471,97 +1527,159 @@ def _fallback_insight(app):
     }
 
 
-def refresh_country_travel_updates(country):
-    """Refresh and cache travel updates payload for a country object."""
-    updates = _fetch_travel_updates(country.name, country.code)
-    weather = _fetch_country_weather(country.name, country.code)
-    payload = {
+@stale_while_revalidate(
+    lambda country_code, country=None, weather=None: f"country_travel_updates_{country_code}",
+    fresh_ttl=TRAVEL_UPDATES_FRESH_TTL,
+    storage_ttl=TRAVEL_UPDATES_STORAGE_TTL,
+    cooldown=TRAVEL_UPDATES_REFRESH_COOLDOWN,
+    jitter=10,
+    priority=PRIORITY_HIGH,
+    # An empty scan is retried inline rather than served until it goes stale.
+    usable=lambda payload: bool(payload.get("updates")),
+)
+def _build_country_travel_updates(country_code, country=None, weather=None):
+    country = country or _get_country_or_404(country_code)
+    calls = {"updates": lambda: _fetch_travel_updates(country.name, country.code)}
+    if weather is None:
+        calls["weather"] = lambda: _fetch_country_weather(country.name, country.code)
+
+    # Weather runs alongside the news sources; allow a little slack over the
+    # inner deadline so the updates fan-out always gets to report back.
+    results = _fan_out(calls, TRAVEL_UPDATES_FETCH_DEADLINE + 2)
+    updates = results.get("updates") or []
+    if weather is None:
+        weather = results.get("weather") or {}
+    return {
         "updates": updates,
         "signal": _summarize_impact(updates),
         "weather": weather,
-        "_meta": {"fetched_at": _now_ts()},
     }
-    key = f"country_travel_updates_{country.code.upper()}"
-    safe_cache_set(key, payload, TRAVEL_UPDATES_STORAGE_TTL)
-    return payload
+
+
+def refresh_country_travel_updates(country, weather=None):
+    """Refresh and cache travel updates payload for a country object.
+
+    Batch refreshes pass ``weather`` prefetched for many countries at once.
+    """
+    return _build_country_travel_updates.refresh(country.code.upper(), country=country, weather=weather)
+
+
+@stale_while_revalidate(
+    lambda app: f"app_traveler_insights_{app.country.code.upper()}_{app.id}",
+    fresh_ttl=TRAVELER_INSIGHTS_FRESH_TTL,
+    storage_ttl=TRAVELER_INSIGHTS_STORAGE_TTL,
+    cooldown=TRAVELER_INSIGHTS_REFRESH_COOLDOWN,
+    jitter=15,
+)
+def _build_app_traveler_insight(app):
+    reviews = _merge_review_sources(app, app.country.name)
+    return _build_insight_from_reviews(app, reviews) if reviews else _fallback_insight(app)
 
 
 def refresh_app_traveler_insight(app):
     """Refresh and cache traveler insight payload for a TravelApp object."""
-    country_code = app.country.code.upper()
-    country_name = app.country.name
+    return _build_app_traveler_insight.refresh(app)
 
-    reviews = _merge_review_sources(app, country_name)
-    insight = _build_insight_from_reviews(app, reviews) if reviews else _fallback_insight(app)
-    insight["_meta"] = {"fetched_at": _now_ts()}
 
-    key = f"app_traveler_insights_{country_code}_{app.id}"
-    safe_cache_set(key, insight, TRAVELER_INSIGHTS_STORAGE_TTL)
-    return insight
+def _travel_updates_payload(payload):
+    if not isinstance(payload, dict):
+        payload = {}
+    return {
+        "updates": payload.get("updates", []),
+        "signal": payload.get("signal", _summarize_impact([])),
+        "weather": payload.get("weather", {}),
+    }
 
 
 @api_view(["GET"])
 def country_travel_updates_view(request, country_code):
     cc = country_code.upper()
-    key = f"country_travel_updates_{cc}"
-    payload = safe_cache_get(key)
-    country = None
+    try:
+        payload = _build_country_travel_updates(cc)
+    except Http404:
+        raise
+    except Exception:
+        payload = None
+    return Response(_travel_updates_payload(payload))
 
-    if payload is None:
-        country = get_object_or_404(Country, code=cc)
-        try:
-            payload = refresh_country_travel_updates(country)
-        except Exception:
-            payload = {"updates": [], "signal": _summarize_impact([]), "_meta": {"fetched_at": 0}}
-    else:
-        has_updates = isinstance(payload, dict) and bool(payload.get("updates"))
-        if not has_updates:
-            country = get_object_or_404(Country, code=cc)
-            try:
-                payload = refresh_country_travel_updates(country)
-            except Exception:
-                pass
-        elif not _is_fresh(payload, TRAVEL_UPDATES_FRESH_TTL):
-            country = get_object_or_404(Country, code=cc)
-            lock_key = f"refresh_lock:travel_updates:{cc}"
-            cooldown_key = f"refresh_cooldown:travel_updates:{cc}"
-            _run_async_with_jitter(
-                lambda: refresh_country_travel_updates(country),
-                lock_key=lock_key,
-                cooldown_key=cooldown_key,
-                cooldown_seconds=TRAVEL_UPDATES_REFRESH_COOLDOWN,
-                jitter_max_seconds=10,
-            )
-    return Response(
-        {
-            "updates": payload.get("updates", []) if isinstance(payload, dict) else [],
-            "signal": payload.get("signal", _summarize_impact([])) if isinstance(payload, dict) else _summarize_impact([]),
-            "weather": payload.get("weather", {}) if isinstance(payload, dict) else {},
-        }
-    )
+
+# Sections the bundle endpoint can compose, keyed by their ?sections= name.
+BUNDLE_SECTION_BUILDERS = {
+    "page": _build_country_page,
+    "apps": _build_country_apps,
+    "essentials": _build_country_essentials,
+    "services": _build_country_services,
+    "travel_updates": _build_country_travel_updates,
+}
+BUNDLE_BUILD_DEADLINE = TRAVEL_UPDATES_FETCH_DEADLINE + 4  # seconds
 
 
 @api_view(["GET"])
-def app_traveler_insights_view(request, country_code, app_id):
+def country_bundle_view(request, country_code):
+    """Several country sections in one response.
+
+    Every requested section's cache entry is read in a single batched cache
+    call; only the sections that are missing (or unusable) are rebuilt, in
+    parallel. Stale entries are served and refreshed in the background, as
+    with the per-section endpoints.
+    """
     cc = country_code.upper()
-    app = get_object_or_404(TravelApp, id=app_id, country__code=cc)
+    raw_sections = str(request.query_params.get("sections") or "")
+    requested = list(dict.fromkeys(part.strip().lower() for part in raw_sections.split(",") if part.strip()))
+    requested = requested or list(BUNDLE_SECTION_BUILDERS)
+    unknown = [section for section in requested if section not in BUNDLE_SECTION_BUILDERS]
+    if unknown:
+        return Response(
+            {"detail": f"Unknown sections: {', '.join(unknown)}", "available": list(BUNDLE_SECTION_BUILDERS)},
+            status=400,
+        )
 
-    key = f"app_traveler_insights_{cc}_{app.id}"
-    insight = safe_cache_get(key)
-    if insight is None:
-        insight = refresh_app_traveler_insight(app)
-    else:
-        if not _is_fresh(insight, TRAVELER_INSIGHTS_FRESH_TTL):
-            lock_key = f"refresh_lock:traveler_insights:{cc}:{app.id}"
-            cooldown_key = f"refresh_cooldown:traveler_insights:{cc}:{app.id}"
-            _run_async_with_jitter(
-                lambda: refresh_app_traveler_insight(app),
-                lock_key=lock_key,
-                cooldown_key=cooldown_key,
-                cooldown_seconds=TRAVELER_INSIGHTS_REFRESH_COOLDOWN,
-                jitter_max_seconds=15,
-            )
+    builders = {section: (BUNDLE_SECTION_BUILDERS[section], cc) for section in requested}
+    origin_code = str(request.query_params.get("origin_country") or "").strip().upper()
+    if "essentials" in builders and origin_code:
+        builders["origin_assistance"] = (_build_origin_assistance, origin_code)
+
+    keys = {section: builder.cache_key(arg) for section, (builder, arg) in builders.items()}
+    entries = read_entries(list(keys.values()))
+
+    results = {}
+    missing = {}
+    for section, (builder, arg) in builders.items():
+        key = keys[section]
+        entry = entries.get(key)
+        if builder.policy.is_usable(entry):
+            results[section] = builder.policy.resolve(key, entry, (arg,), {})
+        else:
+            missing[section] = lambda builder=builder, key=key, entry=entry, arg=arg: builder.policy.resolve(key, entry, (arg,), {})
+
+    if missing:
+        if len(results) == 0:
+            # Nothing cached yet: make sure the country exists before fanning out.
+            _get_country_or_404(cc)
+        results.update(_fan_out(missing, BUNDLE_BUILD_DEADLINE))
+
+    payload = {}
+    for section in requested:
+        if section == "travel_updates":
+            payload[section] = _travel_updates_payload(results.get(section))
+            continue
+        if section not in results:
+            # Failed or timed out; the client falls back to the section endpoint.
+            payload[section] = None
+            continue
+        if section == "essentials":
+            payload[section] = dict(results[section], origin_assistance=results.get("origin_assistance"))
+        elif section == "services":
+            payload[section] = _country_services_payload(cc, results[section])
+        else:
+            payload[section] = results[section]
+    return Response(payload)
+
+
+@api_view(["GET"])
+def app_traveler_insights_view(request, country_code, app_id):
+    cc = country_code.upper()
+    app = get_object_or_404(TravelApp.objects.select_related("country"), id=app_id, country__code=cc)
+    insight = _build_app_traveler_insight(app)
 
-    public_insight = dict(insight or {})
-    public_insight.pop("_meta", None)
-    return Response(public_insight)
\ No newline at end of file
+    return Response(dict(insight or {}))
\ No newline at end of file
@@ -110,6 +110,20 @@ REST_FRAMEWORK = {
     ),
 }
 
+# Encode/decode API JSON with orjson (same output; falls back to DRF's json
+# when orjson isn't installed). See services/renderers.py.
+USE_ORJSON = os.getenv("USE_ORJSON", "True") == "True"
+if USE_ORJSON:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = (
+        'services.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = (
+        'services.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    )
+
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
@@ -231,10 +245,24 @@ CACHES = {
                     "retry_on_timeout": True,
             },
             "IGNORE_EXCEPTIONS": True,
+            # Compresses large values (e.g. nested country pages); see services/codec.py
+            "COMPRESSOR": "services.codec.CacheCompressor",
     }
   }
 }
 
+# zstd / lz4 / zlib / none; "auto" picks the best installed codec.
+CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "auto")
+
+# Precompute country payloads (see `manage.py warm_caches`) after `migrate`
+# and/or in the background when an app server starts.
+CACHE_WARMUP_ON_MIGRATE = os.getenv("CACHE_WARMUP_ON_MIGRATE", "False") == "True"
+CACHE_WARMUP_ON_STARTUP = os.getenv("CACHE_WARMUP_ON_STARTUP", "False") == "True"
+
+# Build hot country payloads from .values() rows instead of DRF serializers
+# (same JSON; see country/fast_serializers.py).
+FAST_SERIALIZERS = os.getenv("FAST_SERIALIZERS", "True") == "True"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -8,13 +8,17 @@ logger = logging.getLogger(__name__)
 # from services.algolia_service import search_countries
 from auth_app.models import UserCountrySuggestion, UserFeedback
 from country.models import Country
+from country import fast_serializers
 from country.serializers import CountrySerializer
 from django.urls import reverse  # ✅ For generating URLs dynamically
 
 @api_view(['GET'])
 def homepage_view(request):
     countries = Country.objects.all()
-    serializer = CountrySerializer(countries, many=True)
+    if fast_serializers.enabled():
+        destinations = fast_serializers.serialize_countries(countries)
+    else:
+        destinations = CountrySerializer(countries, many=True).data
 
     data = {
         "hero_section": {
@@ -26,7 +30,7 @@ def homepage_view(request):
             "Select the best travel apps",
             "Generate your QR code"
         ],
-        "popular_destinations": serializer.data,
+        "popular_destinations": destinations,
         "footer": {
             "about": "About Travel App Curator",
             "contact": "Contact Us",
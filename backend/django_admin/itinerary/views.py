@@ -5,6 +5,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from .models import Itinerary, LegSuggestionRule
 from country.models import TravelApp
+from country.serializers import TravelAppSerializer
 from .serializers import ItinerarySerializer, LegSuggestionSerializer
 
 class LegSuggestionsView(APIView):
@@ -23,9 +24,9 @@ class LegSuggestionsView(APIView):
             try:
                 rule = LegSuggestionRule.objects.get(stop_type=stop.stop_type)
                 # collect apps in those categories, limit 3
-                apps = TravelApp.objects.filter(
+                apps = TravelAppSerializer.prefetch(TravelApp.objects.filter(
                     category__in=rule.categories.all()
-                ).order_by('-rating')[:3]
+                )).order_by('-rating')[:3]
             except LegSuggestionRule.DoesNotExist:
                 apps = TravelApp.objects.none()
 
@@ -2,17 +2,35 @@
 import redis
 from django.conf import settings
 
+from services import codec
+
 # Redis connection for personal lists
 # redis_client = redis.StrictRedis(
 #     host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB_PERSONAL_LISTS, decode_responses=True
 # )
 
 # Redis connection for personal lists, using the REDIS_URL or REDIS_URL_PERSONAL_LISTS
+# Values are bytes written by services.codec (JSON, compressed when large).
 redis_client = redis.from_url(
     settings.REDIS_URL_PERSONAL_LISTS,
-    decode_responses=True
+    decode_responses=False
 )
 
+SESSION_TTL = 86400  # 24h
+
+
+def save_session_apps(session_id, apps, ttl=SESSION_TTL):
+    redis_client.setex(session_id, ttl, codec.dumps(apps))
+
+
+def load_session_apps(session_id):
+    """The app list stored for a session, or None if it expired or never existed."""
+    data = redis_client.get(session_id)
+    if not data:
+        return None
+    return codec.loads(data)
+
+
 def clean_expired_sessions():
     """
     Periodically cleans expired session data from Redis.
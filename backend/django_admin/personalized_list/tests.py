@@ -1,3 +1,29 @@
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from country.models import AppCategory, Country, TravelApp
+
+
+class PersonalAppListQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        country = Country.objects.create(code="TT", name="Testland")
+        category = AppCategory.objects.create(name="Category")
+        cls.app_ids = [
+            TravelApp.objects.create(name=f"App {i}", category=category, country=country).id for i in range(6)
+        ]
+
+    def count_queries(self, app_ids):
+        with mock.patch("personalized_list.views.save_session_apps"):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(
+                    "/api/personalized-list/", {"selected_apps": app_ids}, content_type="application/json"
+                )
+        self.assertEqual(response.status_code, 201)
+        return len(queries)
 
-# Create your tests here.
+    def test_create_list_is_not_n_plus_one(self):
+        self.assertEqual(self.count_queries(self.app_ids[:6]), self.count_queries(self.app_ids[:2]))
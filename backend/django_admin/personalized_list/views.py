@@ -14,18 +14,17 @@ from django.http import HttpResponse
 import base64
 # from personalized_list.models import App  # Assuming App model exists
 from services.qrcode_service import generate_qr_code  # Import the QR service
-from .tasks import redis_client
+from .tasks import redis_client, load_session_apps, save_session_apps
 from rest_framework import status
 from rest_framework.decorators import api_view
 
 
 @api_view(['GET'])
 def get_bundle_urls(request, session_id):
-    data = redis_client.get(session_id)
-    if not data:
+    apps = load_session_apps(session_id)
+    if apps is None:
         return Response({'items': []}, status=status.HTTP_404_NOT_FOUND)
 
-    apps = json.loads(data)
     items = []
     for a in apps:
         items.append({
@@ -47,7 +46,7 @@ class InitSessionView(APIView):
         Generate a session ID and store an empty app list in Redis (expires in 24 hours).
         """
         session_id = str(uuid.uuid4())  # Generate unique session ID
-        redis_client.setex(session_id, 86400, json.dumps([]))  # Store empty list in Redis
+        save_session_apps(session_id, [])  # Store empty list in Redis
         
         return Response({"session_id": session_id, "message": "Session initialized successfully!"}, status=status.HTTP_201_CREATED)
 
@@ -77,7 +76,7 @@ class PersonalAppListView(APIView):
 
         # Serialize app data and store in Redis (expires in 24 hours)
         serialized_apps = TravelAppSerializer(valid_apps, many=True).data
-        redis_client.setex(session_id, 86400, json.dumps(serialized_apps))
+        save_session_apps(session_id, serialized_apps)
 
         return Response({
             "session_id": session_id,
@@ -89,13 +88,11 @@ class PersonalAppListView(APIView):
         """
         Retrieve selected apps using session ID.
         """
-        selected_apps_json = redis_client.get(session_id)
+        selected_apps = load_session_apps(session_id)
 
-        if not selected_apps_json:
+        if selected_apps is None:
             return Response({"error": "Session not found or expired"}, status=status.HTTP_404_NOT_FOUND)
 
-        selected_apps = json.loads(selected_apps_json)
-
         return Response({"session_id": session_id, "selected_apps": selected_apps}, status=status.HTTP_200_OK)
 
 
@@ -108,12 +105,11 @@ class GenerateQRCodeView(APIView):
         """
         Generate and return a QR code for the selected app list.
         """
-        selected_apps_json = redis_client.get(session_id)
+        selected_app_dicts = load_session_apps(session_id)
 
-        if not selected_apps_json:
+        if selected_app_dicts is None:
             return Response({"error": "Session not found or expired"}, status=status.HTTP_404_NOT_FOUND)
 
-        selected_app_dicts = json.loads(selected_apps_json)
         selected_app_ids = [app["id"] for app in selected_app_dicts]  # Extract only IDs
         apps = TravelApp.objects.filter(id__in=selected_app_ids)
 
@@ -139,10 +135,11 @@ class GenerateQRCodeView(APIView):
 from django.http import HttpResponse
 from rest_framework import status
 from rest_framework.views import APIView
-import json, requests
+import json
 from datetime import datetime
-from .tasks import redis_client
+from .tasks import redis_client, load_session_apps
 from django.conf import settings
+from country.http_client import fetch_bytes
 from country.models import TravelApp
 from .serializers import TravelAppSerializer
 from django.contrib.staticfiles import finders
@@ -155,16 +152,15 @@ class DownloadAppListTextView(APIView):
     (all icons & logos embedded as data:URIs) so it works offline.
     """
     def get(self, request, session_id):
-        selected_apps_json = redis_client.get(session_id)
-        if not selected_apps_json:
+        # decode session
+        selected_app_dicts = load_session_apps(session_id)
+        if selected_app_dicts is None:
             return HttpResponse(
                 "<h1>Bundle Not Found</h1><p>Your session has expired or does not exist.</p>",
                 status=status.HTTP_404_NOT_FOUND,
                 content_type="text/html"
             )
 
-        # decode session
-        selected_app_dicts = json.loads(selected_apps_json)
         app_ids = [app["id"] for app in selected_app_dicts]
         apps_qs = TravelApp.objects.filter(id__in=app_ids)
         apps_data = TravelAppSerializer(apps_qs, many=True).data
@@ -223,9 +219,9 @@ class DownloadAppListTextView(APIView):
             icon_data_uri = ""
             if icon_url:
                 try:
-                    resp = requests.get(icon_url, timeout=3)
-                    if resp.status_code == 200:
-                        b64 = base64.b64encode(resp.content).decode()
+                    icon_bytes = fetch_bytes(icon_url, timeout=3, conditional=False)
+                    if icon_bytes:
+                        b64 = base64.b64encode(icon_bytes).decode()
                         # guess mime from URL
                         ext = icon_url.split(".")[-1].lower()
                         mime = "png" if ext in ("png","PNG") else "jpeg"
@@ -329,11 +325,10 @@ class EmbedSnippetView(APIView):
 
 
 def bundle_preview(request, session_id):
-    apps_json = redis_client.get(session_id)
-    if not apps_json:
+    apps_data = load_session_apps(session_id)
+    if apps_data is None:
         return render(request, "404.html", status=404)
 
-    apps_data = json.loads(apps_json)
     app_ids = [a['id'] for a in apps_data]
     apps = TravelApp.objects.filter(id__in=app_ids)
 
@@ -352,18 +347,17 @@ def bundle_preview(request, session_id):
 # personalized_list/views.py
 
 from django.shortcuts import render
-from .tasks import redis_client
+from .tasks import load_session_apps
 import json
 
 def bundle_auto_redirect(request, session_id):
     """
     After scanning the QR, this page will open each store link in turn.
     """
-    apps_json = redis_client.get(session_id)
-    if not apps_json:
+    apps_data = load_session_apps(session_id)
+    if apps_data is None:
         return render(request, "404.html", status=404)
 
-    apps_data = json.loads(apps_json)
     urls = []
     for a in apps_data:
         # prefer Android, otherwise iOS
@@ -0,0 +1,151 @@
+# services/codec.py
+"""Compact encoding for cached payloads.
+
+Two layers, usable separately:
+
+* ``compress`` / ``decompress``: bytes above COMPRESSION_MIN_BYTES are
+  compressed with zstd, lz4 or zlib (the first one installed, or the one
+  named by ``settings.CACHE_COMPRESSION``) behind a two-byte tag. Untagged
+  input passes through, so entries written before compression still read.
+* ``dumps`` / ``loads``: JSON (orjson when installed) plus ``compress``, for
+  raw redis clients such as the personal-list sessions.
+
+``CacheCompressor`` plugs ``compress`` into django-redis; the Django cache
+keeps pickling values because some of them are not JSON (bytes, tuples).
+"""
+import json
+import threading
+import zlib
+
+from django.conf import settings
+from django_redis.compressors.base import BaseCompressor
+from django_redis.exceptions import CompressorError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+
+# Never the first byte of JSON text or of a pickle (b"\x80").
+CODEC_MAGIC = b"\xfe"
+COMPRESSION_MIN_BYTES = 1024
+ZSTD_LEVEL = 3
+ZLIB_LEVEL = 6
+
+
+class CodecError(ValueError):
+    pass
+
+
+# zstd contexts are reusable but not thread-safe.
+_zstd_local = threading.local()
+
+
+def _zstd_compress(data):
+    compressor = getattr(_zstd_local, "compressor", None)
+    if compressor is None:
+        compressor = _zstd_local.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return compressor.compress(data)
+
+
+def _zstd_decompress(data):
+    decompressor = getattr(_zstd_local, "decompressor", None)
+    if decompressor is None:
+        decompressor = _zstd_local.decompressor = zstandard.ZstdDecompressor()
+    return decompressor.decompress(data)
+
+
+def _available_codecs():
+    codecs = {}
+    if zstandard is not None:
+        codecs["zstd"] = (b"s", _zstd_compress, _zstd_decompress)
+    if lz4_frame is not None:
+        codecs["lz4"] = (b"l", lz4_frame.compress, lz4_frame.decompress)
+    codecs["zlib"] = (b"z", lambda data: zlib.compress(data, ZLIB_LEVEL), zlib.decompress)
+    return codecs
+
+
+CODECS = _available_codecs()
+_CODECS_BY_TAG = {tag: decompress for tag, _, decompress in CODECS.values()}
+
+
+def compression_name():
+    """Codec used for new writes: settings.CACHE_COMPRESSION if installed, else the best available."""
+    preferred = str(getattr(settings, "CACHE_COMPRESSION", "auto") or "auto").lower()
+    if preferred == "none":
+        return None
+    if preferred in CODECS:
+        return preferred
+    return next(iter(CODECS))
+
+
+def compress(data, min_bytes=COMPRESSION_MIN_BYTES, codec=None):
+    codec = codec or compression_name()
+    if codec is None or len(data) < min_bytes:
+        return data
+    tag, compress_fn, _ = CODECS[codec]
+    packed = CODEC_MAGIC + tag + compress_fn(data)
+    return packed if len(packed) < len(data) else data
+
+
+def is_compressed(data):
+    return data[:1] == CODEC_MAGIC
+
+
+def decompress(data):
+    if not is_compressed(data):
+        return data
+    decompress_fn = _CODECS_BY_TAG.get(data[1:2])
+    if decompress_fn is None:
+        raise CodecError(f"Payload compressed with unavailable codec {data[1:2]!r}")
+    return decompress_fn(data[2:])
+
+
+def json_dumps(value):
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def json_loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value, min_bytes=COMPRESSION_MIN_BYTES):
+    return compress(json_dumps(value), min_bytes=min_bytes)
+
+
+def loads(data):
+    """Inverse of ``dumps``; also reads plain JSON (str or bytes) written before this codec."""
+    if isinstance(data, str):
+        return json_loads(data)
+    return json_loads(decompress(data))
+
+
+class CacheCompressor(BaseCompressor):
+    """django-redis COMPRESSOR using the codec above."""
+
+    def compress(self, value):
+        return compress(value)
+
+    def decompress(self, value):
+        if not is_compressed(value):
+            # Small or pre-existing values; django-redis then reads them as is.
+            raise CompressorError("Value is not compressed")
+        try:
+            return decompress(value)
+        except Exception as e:
+            raise CompressorError from e
@@ -0,0 +1,54 @@
+# services/renderers.py
+"""orjson-backed DRF renderer and parser (settings.USE_ORJSON).
+
+Output matches rest_framework's JSONRenderer for the payloads this API
+serves: types orjson doesn't handle the same way (datetimes, Decimals, lazy
+strings...) go through DRF's own encoder, and data orjson refuses (integers
+beyond 64 bits) is rendered by JSONRenderer itself. Two differences remain,
+both in floats: orjson writes exponents without padding or sign ("1e16",
+"1e-7" where DRF writes "1e+16", "1e-07"), and it renders NaN/Infinity as
+null where DRF raises. Without orjson installed, or when the client asks for
+indented output, both classes defer to the stock implementations.
+"""
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Datetimes are passed through so they get DRF's format (ms precision, "Z").
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson is not None else 0
+
+_drf_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        try:
+            ret = orjson.dumps(data, default=_drf_encoder.default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Like JSONRenderer: U+2028/U+2029 are valid JSON but break JavaScript.
+        if b"\xe2\x80" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")